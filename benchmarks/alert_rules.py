@@ -0,0 +1,87 @@
+"""
+Full alert rule evaluation over a synthetic catalog.
+
+Seeds a throwaway InventoryRepository database and times, best of a few
+runs, what the alerts screen does on open: the vectorised rule pass alone,
+the complete `alerts()` call (stock columns and names read from the
+repository, Alert records for every hit) and filling an AlertStore with
+the result.
+
+    python -m benchmarks.alert_rules [SKUS]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from services.alert_rules import AlertRuleEngine
+from services.alert_store import AlertStore
+from services.inventory_repository import InventoryRepository
+
+RUNS = 5
+
+CATEGORIES = ("Electronics", "Furniture", "Accessories", "Lighting", "Stationery")
+
+
+def _items(skus: int) -> list[dict]:
+    rng = np.random.default_rng(42)
+    now = time.time()
+    last_sale = now - rng.uniform(0, 200, skus) * 86400
+    never_sold = rng.random(skus) < 0.1
+    # Right-skewed stock levels: most SKUs mid-range, a long tail
+    quantity = rng.gamma(2.0, 30.0, skus).astype(np.int64)
+    reorder_point = rng.integers(5, 30, skus)
+    overstock_ceiling = rng.integers(100, 250, skus)
+    return [
+        {
+            "name": f"Product {i:06d}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "quantity": int(quantity[i]),
+            "updated": now,
+            "reorder_point": int(reorder_point[i]),
+            "overstock_ceiling": int(overstock_ceiling[i]),
+            "dead_stock_days": 90,
+            "last_sale": None if never_sold[i] else float(last_sale[i]),
+        }
+        for i in range(skus)
+    ]
+
+
+def _best(fn) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _fill(alerts) -> AlertStore:
+    store = AlertStore()
+    store.add_many(alerts)
+    return store
+
+
+def main(skus: int = 100_000):
+    # The repository keeps its connection open, which Windows will not delete
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmp:
+        repo = InventoryRepository(os.path.join(tmp, "inventory.db"))
+        repo.seed(_items(skus))
+        engine = AlertRuleEngine()
+
+        rules_s, hits = _best(lambda: engine.evaluate(repo.stock_columns()))
+        alerts_s, alerts = _best(lambda: engine.alerts(repo))
+        store_s, _ = _best(lambda: _fill(alerts))
+
+    print(f"{skus:,} SKUs, {len(engine.rules)} rules")
+    for rule in engine.rules:
+        print(f"  {rule.id:<12} {len(hits[rule.id][0]):>8,} hits")
+    print(f"  rule pass:       {rules_s * 1000:8.1f} ms")
+    print(f"  alerts():        {alerts_s * 1000:8.1f} ms  ({len(alerts):,} alerts)")
+    print(f"  store fill:      {store_s * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,91 @@
+"""
+Memory per SKU of the product records a session holds.
+
+Compares the old representation (one dict per row, status / category /
+"2 hours ago" strings copied out of SQLite for every row) with the slotted
+Product records. Rows are read from a throwaway SQLite database, as the app
+reads them, so string sharing is realistic.
+
+    python -m benchmarks.product_memory [SKUS]
+"""
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+from services.product import Product, Status, format_relative
+
+CATEGORIES = ("Electronics", "Furniture", "Accessories", "Lighting", "Stationery")
+
+
+def _database(skus: int) -> sqlite3.Connection:
+    rng = random.Random(42)
+    now = time.time()
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, category TEXT, "
+        "quantity INTEGER, status TEXT, updated REAL, updated_text TEXT)"
+    )
+    rows = []
+    for i in range(skus):
+        updated = now - rng.randrange(30 * 86400)
+        rows.append((
+            f"Product {i:06d}",
+            rng.choice(CATEGORIES),
+            rng.randrange(500),
+            rng.choice(list(Status)).value,
+            updated,
+            format_relative(updated, now),
+        ))
+    conn.executemany(
+        "INSERT INTO items (name, category, quantity, status, updated, updated_text) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    return conn
+
+
+def _measure(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return after - before
+
+
+def main(skus: int = 100_000):
+    conn = _database(skus)
+    conn.row_factory = sqlite3.Row
+
+    def dicts():
+        # Before: dict(row) per item, `updated` as display text
+        return [
+            dict(row)
+            for row in conn.execute(
+                "SELECT id, name, category, quantity, status, "
+                "updated_text AS updated FROM items"
+            )
+        ]
+
+    def products():
+        # After: slotted records, interned category, shared Status, epoch time
+        return [
+            Product.from_row(row)
+            for row in conn.execute(
+                "SELECT id, name, category, quantity, status, updated FROM items"
+            )
+        ]
+
+    before = _measure(dicts)
+    after = _measure(products)
+    print(f"{skus:,} SKUs")
+    print(f"  dict records:    {before / skus:7.1f} bytes/SKU  ({before / 2**20:6.1f} MiB)")
+    print(f"  Product records: {after / skus:7.1f} bytes/SKU  ({after / 2**20:6.1f} MiB)")
+    print(f"  saved:           {1 - after / before:7.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
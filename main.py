@@ -1,11 +1,14 @@
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import asyncio
+import importlib
+import os
+from collections import OrderedDict
+
 import flet as ft
 from screens.login import LoginPage
-from screens.dashboard import DashboardPage
-from screens.chat import ChatPage
-from screens.inventory import InventoryPage
-from screens.alerts import AlertsPage
-from screens.analytics import AnalyticsPage
-from screens.settings import SettingsPage
 
 
 NAV_ITEMS = [
@@ -17,6 +20,30 @@ NAV_ITEMS = [
     {"label": "Settings", "target": "settings", "icon": ft.Icons.SETTINGS_OUTLINED},
 ]
 
+# Screen classes, keyed by session "screen" value, as (module, class name).
+# Modules are imported on first navigation so they stay off the login path,
+# and only the requested screen is constructed.
+SCREEN_REGISTRY = {
+    "dashboard": ("screens.dashboard", "DashboardPage"),
+    "chat": ("screens.chat", "ChatPage"),
+    "inventory": ("screens.inventory", "InventoryPage"),
+    "alerts": ("screens.alerts", "AlertsPage"),
+    "analytics": ("screens.analytics", "AnalyticsPage"),
+    "settings": ("screens.settings", "SettingsPage"),
+}
+
+# Import the remaining screen modules in the background once login is shown.
+WARM_UP_SCREENS = os.environ.get("VYAPAR_WARM_UP_SCREENS", "1") != "0"
+
+# How many built screens each session keeps alive (0 disables the cache).
+SCREEN_CACHE_SIZE = int(os.environ.get("VYAPAR_SCREEN_CACHE_SIZE", "4"))
+
+# Below this width the shell switches to the mobile layout.
+MOBILE_BREAKPOINT = 800
+
+# Quiet period after the last resize event before the shell layout is swapped.
+RESIZE_DEBOUNCE_S = 0.15
+
 
 def main(page: ft.Page):
     # Global page config
@@ -30,25 +57,42 @@ def main(page: ft.Page):
 
     # Initial route / session
     page.session.set("screen", "login")
+    screen_cache = ScreenCache(page=page, max_size=SCREEN_CACHE_SIZE)
+
+    # Shell state, so navigation and resizes can re-home the current content
+    # without rebuilding the screen or the navigation
+    current_content: ft.Control | None = None
+    shell_view: ft.View | None = None
+    content_host: ft.Container | None = None
+    shell_is_mobile: bool | None = None
+    pending_resize = None
+
+    # Navigation components live for the whole session; route changes only
+    # move their active item
+    nav_menu: NavigationMenu | None = None
+    nav_bar: ft.NavigationBar | None = None
 
     # ----------------- Navigation helpers -----------------
 
     def set_screen(target: str):
         page.session.set("screen", target)
         if target == "login":
+            # Don't carry one user's screen state or alerts over to the
+            # next login
+            screen_cache.clear()
+            # Imported here like the screens, to keep NumPy off startup
+            from services.session_alerts import SessionAlerts
+
+            SessionAlerts.discard(page)
             page.go("/login")
         else:
             page.go(f"/{target}")
 
     def load_screen(name: str, page: ft.Page) -> ft.Control:
-        return {
-            "dashboard": DashboardPage(page=page),
-            "chat": ChatPage(page=page),
-            "inventory": InventoryPage(page=page),
-            "alerts": AlertsPage(page=page),
-            "analytics": AnalyticsPage(page=page),
-            "settings": SettingsPage(page=page),
-        }.get(name, ft.Column(controls=[ft.Text("Page not found")]))
+        screen = screen_cache.get(name)
+        if screen is None:
+            return ft.Column(controls=[ft.Text("Page not found")])
+        return screen
 
     # ----------------- Layout builder -----------------
 
@@ -58,11 +102,33 @@ def main(page: ft.Page):
         - Desktop / tablet: persistent left sidebar
         - Mobile: top app bar + bottom navigation bar
         """
-        is_mobile = page.width is not None and page.width < 800
+        nonlocal shell_view, content_host, shell_is_mobile, nav_menu, nav_bar
+        active_screen = page.session.get("screen")
+        content_host = ft.Container(
+            expand=True,
+            padding=16,
+            bgcolor="#020617",
+            content=content,
+        )
+        shell_is_mobile = _is_mobile_width(page.width)
+
+        if shell_is_mobile:
+            if nav_bar is None:
+                nav_bar = ft.NavigationBar(
+                    destinations=[
+                        ft.NavigationDestination(
+                            icon=item["icon"], label=item["label"]
+                        )
+                        for item in NAV_ITEMS
+                    ],
+                    on_change=lambda e: set_screen(
+                        NAV_ITEMS[e.control.selected_index]["target"]
+                    ),
+                )
+            nav_bar.selected_index = _get_nav_index(active_screen)
 
-        if is_mobile:
             # Mobile layout: content + bottom navigation
-            return ft.View(
+            shell_view = ft.View(
                 route=page.route,
                 padding=0,
                 bgcolor="#000000",
@@ -105,34 +171,27 @@ def main(page: ft.Page):
                             ),
                             ft.Divider(height=1, color="#1E293B"),
                             # Page content
-                            ft.Container(
-                                expand=True,
-                                padding=16,
-                                bgcolor="#020617",
-                                content=content,
-                            ),
+                            content_host,
                         ],
                     ),
                 ],
                 bottom_appbar=ft.Container(
                     bgcolor="#020617",
-                    content=ft.NavigationBar(
-                        selected_index=_get_nav_index(page.session.get("screen")),
-                        destinations=[
-                            ft.NavigationDestination(
-                                icon=item["icon"], label=item["label"]
-                            )
-                            for item in NAV_ITEMS
-                        ],
-                        on_change=lambda e: set_screen(
-                            NAV_ITEMS[e.control.selected_index]["target"]
-                        ),
-                    ),
+                    content=nav_bar,
                 ),
             )
+            return shell_view
 
         # Desktop / tablet layout: persistent sidebar
-        return ft.View(
+        if nav_menu is None:
+            nav_menu = NavigationMenu(
+                page=page,
+                active_screen=active_screen,
+                on_change=set_screen,
+            )
+        else:
+            nav_menu.set_active(active_screen)
+        shell_view = ft.View(
             route=page.route,
             padding=0,
             bgcolor="#020617",
@@ -145,31 +204,57 @@ def main(page: ft.Page):
                             width=260,
                             bgcolor="#020617",
                             padding=16,
-                            content=NavigationMenu(
-                                page=page,
-                                active_screen=page.session.get("screen"),
-                                on_change=set_screen,
-                            ),
+                            content=nav_menu,
                         ),
                         ft.VerticalDivider(width=1, color="#1E293B"),
-                        ft.Container(
-                            expand=True,
-                            padding=16,
-                            bgcolor="#020617",
-                            content=content,
-                        ),
+                        content_host,
                     ],
                 )
             ],
         )
+        return shell_view
+
+    def show_in_shell(content: ft.Control) -> bool:
+        """
+        Swap `content` into the current shell and move the nav highlight.
+        Returns False when there is no reusable shell for the current layout.
+        """
+        if (
+            shell_view is None
+            or not page.views
+            or page.views[-1] is not shell_view
+            or _is_mobile_width(page.width) != shell_is_mobile
+        ):
+            return False
+
+        active_screen = page.session.get("screen")
+        shell_view.route = page.route
+        content_host.content = content
+        if shell_is_mobile:
+            nav_bar.selected_index = _get_nav_index(active_screen)
+        else:
+            nav_menu.set_active(active_screen)
+        return True
+
+    def release_content():
+        """
+        Take the screen out of the current shell before that shell is
+        replaced. Flet detaches the controls an update removes only after
+        mounting the ones it adds, so a screen moved to a new shell in the
+        same update would be left without a page.
+        """
+        if content_host is not None and content_host.content is not None:
+            content_host.content = None
+            page.update()
 
     # ----------------- Route handling -----------------
 
     def route_change(route):
-        page.views.clear()
+        nonlocal current_content, shell_view
         current_screen = page.session.get("screen") or "login"
 
         if current_screen == "login":
+            page.views.clear()
             page.views.append(
                 ft.View(
                     "/login",
@@ -177,11 +262,23 @@ def main(page: ft.Page):
                     controls=[LoginPage(page=page)],
                 )
             )
+            current_content = None
+            shell_view = None
         else:
-            page.views.append(build_shell(load_screen(current_screen, page)))
+            current_content = load_screen(current_screen, page)
+            if not show_in_shell(current_content):
+                if content_host is not None and content_host.content is current_content:
+                    release_content()
+                page.views.clear()
+                page.views.append(build_shell(current_content))
 
         page.update()
 
+        if current_screen == "login":
+            _report_startup_timing()
+            if WARM_UP_SCREENS:
+                page.run_thread(_warm_up_screens)
+
     def view_pop(view):
         # Basic back-navigation behavior
         if len(page.views) > 1:
@@ -191,10 +288,31 @@ def main(page: ft.Page):
     page.on_route_change = route_change
     page.on_view_pop = view_pop
 
-    # React to window resize to re-build adaptive layout
+    # React to window resize: only swap the shell when the breakpoint is
+    # crossed, and only once the resize has settled
     def on_resize(e):
-        if page.session.get("screen") != "login":
-            route_change(page.route)
+        nonlocal pending_resize
+        if pending_resize is not None:
+            pending_resize.cancel()
+            pending_resize = None
+        if current_content is None:
+            return
+        if _is_mobile_width(page.width) != shell_is_mobile:
+            pending_resize = page.run_task(swap_shell_after_resize)
+
+    async def swap_shell_after_resize():
+        nonlocal pending_resize
+        await asyncio.sleep(RESIZE_DEBOUNCE_S)
+        pending_resize = None
+        if current_content is None:
+            return
+        if _is_mobile_width(page.width) == shell_is_mobile:
+            return
+
+        # Move the existing screen into a shell for the new layout
+        release_content()
+        page.views[-1] = build_shell(current_content)
+        page.update()
 
     page.on_resize = on_resize
 
@@ -202,6 +320,65 @@ def main(page: ft.Page):
     page.go("/login")
 
 
+# ----------------- Screen cache -----------------
+
+
+class ScreenCache:
+    """
+    Per-session LRU of built screens.
+
+    Screens are built on first visit through SCREEN_REGISTRY; revisiting one of
+    the `max_size` most recently used screens reuses the instance (and its
+    search text, filters, chat history...) instead of rebuilding it.
+
+    A screen that leaves the cache (evicted, cleared on logout, or replaced
+    when caching is off) has its `dispose()` called, if it defines one, so
+    it stops listening to shared services at once rather than whenever the
+    garbage collector gets to it.
+    """
+
+    def __init__(self, page: ft.Page, max_size: int = SCREEN_CACHE_SIZE):
+        self.page = page
+        self.max_size = max_size
+        self._screens: "OrderedDict[str, ft.Control]" = OrderedDict()
+        # With caching off, the one screen built last
+        self._uncached: ft.Control | None = None
+
+    def get(self, name: str) -> ft.Control | None:
+        screen = self._screens.get(name)
+        if screen is not None:
+            self._screens.move_to_end(name)
+            return screen
+
+        factory = _resolve_screen(name)
+        if factory is None:
+            return None
+
+        screen = factory(page=self.page)
+        if self.max_size > 0:
+            self._screens[name] = screen
+            while len(self._screens) > self.max_size:
+                # evict least recently used screen
+                _dispose(self._screens.popitem(last=False)[1])
+        else:
+            _dispose(self._uncached)
+            self._uncached = screen
+        return screen
+
+    def clear(self):
+        for screen in self._screens.values():
+            _dispose(screen)
+        self._screens.clear()
+        _dispose(self._uncached)
+        self._uncached = None
+
+
+def _dispose(screen: ft.Control | None):
+    dispose = getattr(screen, "dispose", None)
+    if dispose is not None:
+        dispose()
+
+
 # ----------------- Navigation menu component -----------------
 
 
@@ -215,6 +392,9 @@ class NavigationMenu(ft.Column):
         self.active_screen = active_screen
         self.on_change = on_change
 
+        # target -> (container, icon, label) for in-place highlight updates
+        self._buttons: dict[str, tuple[ft.Container, ft.Icon, ft.Text]] = {}
+
         header = ft.Row(
             alignment=ft.MainAxisAlignment.START,
             spacing=10,
@@ -263,34 +443,77 @@ class NavigationMenu(ft.Column):
             logout_btn,
         ]
 
+    def set_active(self, active_screen: str):
+        """Move the highlight, touching only the previous and new buttons."""
+        if active_screen == self.active_screen:
+            return
+        previous = self.active_screen
+        self.active_screen = active_screen
+        for target in (previous, active_screen):
+            if target in self._buttons:
+                self._apply_style(target)
+
     def _nav_button(self, label: str, target: str, icon):
-        is_active = target == self.active_screen
-        return ft.Container(
+        icon_control = ft.Icon(icon, size=20)
+        label_control = ft.Text(label, size=15)
+        button = ft.Container(
             padding=6,
             border_radius=8,
-            bgcolor="#0B1220" if is_active else None,
             ink=True,
             on_click=lambda _: self.on_change(target),
             content=ft.Row(
                 alignment=ft.MainAxisAlignment.START,
                 spacing=10,
                 vertical_alignment=ft.CrossAxisAlignment.CENTER,
-                controls=[
-                    ft.Icon(
-                        icon,
-                        color="#FBBF24" if is_active else "#D1D5DB",  # AMBER / GREY_300
-                        size=20,
-                    ),
-                    ft.Text(
-                        label,
-                        size=15,
-                        weight=ft.FontWeight.W_500
-                        if is_active
-                        else ft.FontWeight.NORMAL,
-                    ),
-                ],
+                controls=[icon_control, label_control],
             ),
         )
+        self._buttons[target] = (button, icon_control, label_control)
+        self._apply_style(target)
+        return button
+
+    def _apply_style(self, target: str):
+        button, icon_control, label_control = self._buttons[target]
+        is_active = target == self.active_screen
+        button.bgcolor = "#0B1220" if is_active else None
+        icon_control.color = "#FBBF24" if is_active else "#D1D5DB"  # AMBER / GREY_300
+        label_control.weight = (
+            ft.FontWeight.W_500 if is_active else ft.FontWeight.NORMAL
+        )
+
+
+# ----------------- Deferred screen loading -----------------
+
+
+_startup_reported = False
+
+
+def _resolve_screen(name: str):
+    entry = SCREEN_REGISTRY.get(name)
+    if entry is None:
+        return None
+    module_name, class_name = entry
+    # import_module is a sys.modules lookup after the first call
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _warm_up_screens():
+    for module_name, _ in SCREEN_REGISTRY.values():
+        importlib.import_module(module_name)
+
+
+def _report_startup_timing():
+    """Print the time from process start to the first LoginPage render."""
+    global _startup_reported
+    if _startup_reported:
+        return
+    _startup_reported = True
+    elapsed_ms = (time.perf_counter() - _PROCESS_START) * 1000
+    print(f"[startup] first LoginPage render: {elapsed_ms:.0f} ms after process start")
+
+
+def _is_mobile_width(width) -> bool:
+    return width is not None and width < MOBILE_BREAKPOINT
 
 
 def _get_nav_index(screen: str) -> int:
@@ -300,4 +523,6 @@ def _get_nav_index(screen: str) -> int:
     return 0
 
 
-ft.app(target=main, assets_dir="assets")
+# Guarded so worker processes (data export) can import this module
+if __name__ == "__main__":
+    ft.app(target=main, assets_dir="assets")
@@ -1,5 +1,28 @@
+from collections import OrderedDict
+
 import flet as ft
 
+from services.alert_rules import Alert
+from services.debounced_search import DebouncedSearch
+from services.product import format_relative
+from services.relative_time import RelativeTimeTicker
+from services.session_alerts import SessionAlerts
+
+
+# Alert cards rendered at most; the rest are reached by filtering.
+MAX_RENDERED_ALERTS = 100
+
+# Built cards kept per alert id, reused while the alert is unchanged
+CARD_CACHE_SIZE = 2 * MAX_RENDERED_ALERTS
+
+_TYPE_ICONS = {
+    "Low Stock Warning": ft.Icons.WARNING_AMBER,
+    "Overstock Alert": ft.Icons.INVENTORY_2,
+    "Dead Stock Alert": ft.Icons.HOURGLASS_EMPTY,
+    "Demand Spike Prediction": ft.Icons.SHOW_CHART,
+    "Stock Mismatch Detected": ft.Icons.ERROR_OUTLINE,
+}
+
 
 class AlertsPage(ft.Column):
     def __init__(self, page: ft.Page):
@@ -10,8 +33,24 @@ class AlertsPage(ft.Column):
         )
         self.page = page
 
-        # In real app, these will be loaded from backend via a service
-        self.alerts_data = self._mock_alerts()
+        # The session's alerts outlive this screen; it shows their store
+        # and re-renders when they change
+        self.alerts = SessionAlerts.for_page(page)
+        self.store = self.alerts.store
+
+        # (time label, raised-at timestamp) of the rendered cards, advanced
+        # by the session's shared ticker
+        self._time_labels: list[tuple[ft.Text, float]] = []
+
+        # alert id -> (card signature, card control)
+        self._card_cache: "OrderedDict[str, tuple[tuple, ft.Control]]" = OrderedDict()
+        self._ticker = RelativeTimeTicker.for_page(page)
+
+        self._search = DebouncedSearch(
+            page=page,
+            query=self._query_alerts,
+            render=self._render_alerts,
+        )
 
         self.controls = [
             self._top_bar(),
@@ -19,6 +58,27 @@ class AlertsPage(ft.Column):
             self._filters_row(),
             self._alerts_list(),
         ]
+        if self.alerts.loaded:
+            self._show_alerts()
+        else:
+            # The first fill takes seconds at 100k SKUs; the screen opens
+            # on a loading state and renders when it is done
+            self._update_summary()
+        self.alerts.listen(self._show_alerts)
+
+    # ------------- Lifecycle -------------
+
+    def did_mount(self):
+        self._ticker.register(self._visible_times)
+
+    def will_unmount(self):
+        self._ticker.unregister(self._visible_times)
+
+    def dispose(self):
+        """Stop listening to shared services; the screen cache dropped it."""
+        self.alerts.unlisten(self._show_alerts)
+        self._ticker.unregister(self._visible_times)
+        self._search.cancel()
 
     # ------------- Top bar -------------
 
@@ -71,9 +131,11 @@ class AlertsPage(ft.Column):
     # ------------- Header / Stats -------------
 
     def _summary_header(self) -> ft.Control:
-        total = len(self.alerts_data)
-        critical = sum(1 for a in self.alerts_data if a["severity"] == "critical")
-        warning = sum(1 for a in self.alerts_data if a["severity"] == "warning")
+        # Figures come from the store's counters and are patched in place
+        # by _update_summary after every change
+        self.total_text = ft.Text("", size=12, color="#9CA3AF")  # GREY_400
+        self.critical_text = ft.Text("", size=20, weight=ft.FontWeight.BOLD)
+        self.warning_text = ft.Text("", size=20, weight=ft.FontWeight.BOLD)
 
         return ft.ResponsiveRow(
             controls=[
@@ -91,11 +153,7 @@ class AlertsPage(ft.Column):
                                 size=16,
                                 weight=ft.FontWeight.W_600,
                             ),
-                            ft.Text(
-                                f"{total} alerts currently monitored",
-                                size=12,
-                                color="#9CA3AF",  # GREY_400
-                            ),
+                            self.total_text,
                         ],
                     ),
                 ),
@@ -122,11 +180,7 @@ class AlertsPage(ft.Column):
                                     ),
                                 ],
                             ),
-                            ft.Text(
-                                str(critical),
-                                size=20,
-                                weight=ft.FontWeight.BOLD,
-                            ),
+                            self.critical_text,
                         ],
                     ),
                 ),
@@ -153,60 +207,67 @@ class AlertsPage(ft.Column):
                                     ),
                                 ],
                             ),
-                            ft.Text(
-                                str(warning),
-                                size=20,
-                                weight=ft.FontWeight.BOLD,
-                            ),
+                            self.warning_text,
                         ],
                     ),
                 ),
             ]
         )
 
+    def _update_summary(self):
+        if not self.alerts.loaded:
+            self.total_text.value = "Evaluating alert rules..."
+            return
+        self.total_text.value = f"{self.store.active:,} alerts currently monitored"
+        self.critical_text.value = f"{self.store.severity_count('critical'):,}"
+        self.warning_text.value = f"{self.store.severity_count('warning'):,}"
+        for option in self.type_dropdown.options:
+            if option.key != "all":
+                option.text = f"{option.key} ({self.store.type_count(option.key):,})"
+
     # ------------- Filters / Search -------------
 
     def _filters_row(self) -> ft.Control:
+        self.search_field = ft.TextField(
+            col={"xs": 12, "md": 4},
+            label="Search by product or alert type",
+            prefix_icon=ft.Icons.SEARCH,
+            dense=True,
+            border_radius=20,
+            on_change=self._on_search_change,
+        )
+        self.severity_dropdown = ft.Dropdown(
+            col={"xs": 6, "md": 2},
+            label="Severity",
+            dense=True,
+            border_radius=20,
+            options=[
+                ft.dropdown.Option("all"),
+                ft.dropdown.Option("critical"),
+                ft.dropdown.Option("warning"),
+                ft.dropdown.Option("info"),
+            ],
+            value="all",
+            on_change=self._on_filter_change,
+        )
+        # Types present in the store, added as they appear
+        self.type_dropdown = ft.Dropdown(
+            col={"xs": 6, "md": 2},
+            label="Type",
+            dense=True,
+            border_radius=20,
+            options=[
+                ft.dropdown.Option("all"),
+            ],
+            value="all",
+            on_change=self._on_filter_change,
+        )
         return ft.ResponsiveRow(
             run_spacing=8,
             controls=[
-                ft.TextField(
-                    col={"xs": 12, "md": 4},
-                    label="Search by product or alert type",
-                    prefix_icon=ft.Icons.SEARCH,
-                    dense=True,
-                    border_radius=20,
-                    on_change=self._on_search_change,
-                ),
-                ft.Dropdown(
-                    col={"xs": 6, "md": 2},
-                    label="Severity",
-                    dense=True,
-                    border_radius=20,
-                    options=[
-                        ft.dropdown.Option("all"),
-                        ft.dropdown.Option("critical"),
-                        ft.dropdown.Option("warning"),
-                        ft.dropdown.Option("info"),
-                    ],
-                    value="all",
-                    on_change=self._on_filter_change,
-                ),
-                                ft.Dropdown(
-                    col={"xs": 6, "md": 2},
-                    label="Type",
-                    dense=True,
-                    border_radius=20,
-                    options=[
-                        ft.dropdown.Option("all"),
-                        ft.dropdown.Option("Low Stock"),
-                        ft.dropdown.Option("Overstock"),
-                        ft.dropdown.Option("Demand Spike"),
-                        ft.dropdown.Option("Mismatch"),
-                    ],
-                    value="all",
-                    on_change=self._on_filter_change,
-                ),
+                self.search_field,
+                self.severity_dropdown,
+                self.type_dropdown,
                 ft.Row(
                     col={"xs": 12, "md": 4},
                     alignment=ft.MainAxisAlignment.END,
@@ -229,15 +290,33 @@ class AlertsPage(ft.Column):
     # ------------- Alerts list -------------
 
     def _alerts_list(self) -> ft.Control:
+        # Replaced by the first render once the session's alerts are loaded
         self.alerts_column = ft.Column(
             spacing=12,
             scroll=ft.ScrollMode.AUTO,
+            controls=[
+                ft.Container(
+                    padding=32,
+                    content=ft.Row(
+                        alignment=ft.MainAxisAlignment.CENTER,
+                        controls=[
+                            ft.ProgressRing(width=20, height=20, stroke_width=2),
+                            ft.Text("Loading alerts...", size=14, color="#D1D5DB"),
+                        ],
+                    ),
+                )
+            ],
         )
-        self._render_alerts(self.alerts_data)
         return self.alerts_column
 
     def _render_alerts(self, alerts):
+        """
+        Show `alerts`. Cards are keyed by alert id and reused while the
+        alert is unchanged, so re-rendering after a pushed batch only builds
+        and sends the new cards.
+        """
         self.alerts_column.controls.clear()
+        self._time_labels = []
         if not alerts:
             self.alerts_column.controls.append(
                 ft.Container(
@@ -262,12 +341,38 @@ class AlertsPage(ft.Column):
                 )
             )
         else:
-            for alert in alerts:
-                self.alerts_column.controls.append(self._alert_card(alert))
+            for alert in alerts[:MAX_RENDERED_ALERTS]:
+                self.alerts_column.controls.append(self._keyed_card(alert))
+            if len(alerts) > MAX_RENDERED_ALERTS:
+                self.alerts_column.controls.append(
+                    ft.Text(
+                        f"Showing {MAX_RENDERED_ALERTS} of {len(alerts):,} alerts. "
+                        "Refine the search or filters to see the rest.",
+                        size=12,
+                        color="#9CA3AF",  # GREY_400
+                    )
+                )
+        # Cards on screen were just touched, so they are never evicted
+        while len(self._card_cache) > CARD_CACHE_SIZE:
+            self._card_cache.popitem(last=False)
         # don’t call update() during __init__; page.update() is used after actions
 
-    def _alert_card(self, data: dict) -> ft.Control:
-        severity = data.get("severity", "warning")
+    def _keyed_card(self, alert: Alert) -> ft.Control:
+        signature = _card_signature(alert)
+        cached = self._card_cache.get(alert.id)
+        if cached is not None and cached[0] == signature:
+            card = cached[1]
+        else:
+            card = self._alert_card(alert)
+            self._card_cache[alert.id] = (signature, card)
+        self._card_cache.move_to_end(alert.id)
+        # card.data is the card's time label; unchanged text sends no diff
+        card.data.value = format_relative(alert.time)
+        self._time_labels.append((card.data, alert.time))
+        return card
+
+    def _alert_card(self, data: Alert) -> ft.Control:
+        severity = data.severity
         bg_map = {
             "critical": "#1F2937",
             "warning": "#FEF3C7",
@@ -285,7 +390,14 @@ class AlertsPage(ft.Column):
         text_on_light = "#111827"
         text_on_dark = "#F3F4F6"
 
+        time_label = ft.Text(
+            format_relative(data.time),
+            size=11,
+            color="#4B5563",  # GREY_600
+        )
+
         return ft.Container(
+            data=time_label,
             padding=16,
             border_radius=16,
             bgcolor=bgcolor,
@@ -309,7 +421,7 @@ class AlertsPage(ft.Column):
                                         border_radius=12,
                                         bgcolor="#FFFFFF10",
                                         content=ft.Icon(
-                                            data["icon"],
+                                            _TYPE_ICONS.get(data.type, ft.Icons.NOTIFICATIONS),
                                             color=border_color,
                                             size=24,
                                         ),
@@ -318,7 +430,7 @@ class AlertsPage(ft.Column):
                                         spacing=2,
                                         controls=[
                                             ft.Text(
-                                                data["type"],
+                                                data.type,
                                                 size=16,
                                                 weight=ft.FontWeight.W_600,
                                                 color=text_on_dark
@@ -326,7 +438,7 @@ class AlertsPage(ft.Column):
                                                 else text_on_light,
                                             ),
                                             ft.Text(
-                                                data.get("product", ""),
+                                                data.product,
                                                 size=12,
                                                 color="#9CA3AF",
                                             ),
@@ -335,7 +447,7 @@ class AlertsPage(ft.Column):
                                 ],
                             ),
                             ft.Text(
-                                data["message"],
+                                data.message,
                                 size=13,
                                 color=text_on_light
                                 if bgcolor not in ("#020617", "#1F2937")
@@ -367,15 +479,17 @@ class AlertsPage(ft.Column):
                     ft.Column(
                         horizontal_alignment=ft.CrossAxisAlignment.END,
                         controls=[
+                            time_label,
                             ft.Text(
-                                data["time"],
+                                f"Fired {data.count:,} times",
                                 size=11,
-                                color="#4B5563",  # GREY_600
+                                color="#6B7280",  # GREY_500
+                                visible=data.count > 1,
                             ),
                             ft.Container(height=8),
                             ft.Chip(
                                 label=ft.Text(
-                                    severity.capitalize(),
+                                    "Resolved" if data.resolved else severity.capitalize(),
                                     size=11,
                                 ),
                                 bgcolor="#111827",
@@ -387,41 +501,48 @@ class AlertsPage(ft.Column):
             ),
         )
 
+    def _visible_times(self):
+        """Ticker source: the time label of every rendered card."""
+        return self._time_labels
+
     # ------------- Actions / callbacks -------------
 
     def refresh_alerts(self, e):
-        self._render_alerts(self.alerts_data)
+        if not self.alerts.loaded:
+            return
+        self._update_summary()
+        self._render_alerts(self._query_alerts(*self._current_filters()))
         self.page.update()
 
     def _acknowledge_all(self, e):
-        self.alerts_data = []
-        self._render_alerts(self.alerts_data)
+        self.store.clear()
+        self._update_summary()
+        self._render_alerts([])
         self.page.update()
 
     def _clear_resolved(self, e):
-        self.alerts_data = [
-            a for a in self.alerts_data if not a.get("resolved", False)
-        ]
-        self._render_alerts(self.alerts_data)
-        self.page.update()
+        self.store.remove_many([a.id for a in self.store if a.resolved])
+        self.refresh_alerts(e)
 
     def _handle_action(self, alert):
+        # Acting on an alert resolves it; "Clear resolved" removes it
+        if self.store.resolve(alert.id):
+            self.refresh_alerts(None)
         self.page.snack_bar = ft.SnackBar(
-            content=ft.Text(f"Action triggered for: {alert['type']}"),
+            content=ft.Text(f"Action triggered for: {alert.type}"),
         )
         self.page.snack_bar.open = True
         self.page.update()
 
     def _dismiss_alert(self, alert):
-        self.alerts_data = [a for a in self.alerts_data if a is not alert]
-        self._render_alerts(self.alerts_data)
-        self.page.update()
+        self.store.remove(alert.id)
+        self.refresh_alerts(None)
 
     def _open_details(self, alert):
         dlg = ft.AlertDialog(
             modal=True,
-            title=ft.Text(alert["type"]),
-            content=ft.Text(alert["message"]),
+            title=ft.Text(alert.type),
+            content=ft.Text(alert.message),
             actions= ft.TextButton("Close", on_click=lambda e: self._close_dialog()),
             
         )
@@ -436,72 +557,55 @@ class AlertsPage(ft.Column):
 
     # ------------- Filtering logic -------------
 
+    # Search text, severity and type go through one query on the store's
+    # indexes, so they always compose
+
     def _on_search_change(self, e: ft.ControlEvent):
-        query = (e.control.value or "").lower()
-        filtered = [
-            a
-            for a in self.alerts_data
-            if query in a["type"].lower()
-            or query in a["message"].lower()
-            or query in a.get("product", "").lower()
-        ]
-        self._render_alerts(filtered)
-        self.page.update()
+        # Debounced; only the latest query's result is rendered. While
+        # loading, _show_alerts applies the filters when it renders.
+        if self.alerts.loaded:
+            self._search.submit(*self._current_filters())
 
     def _on_filter_change(self, e: ft.ControlEvent):
-        # Placeholder for combined severity/type filters; re-render with current data
-        self._render_alerts(self.alerts_data)
-        self.page.update()
-
-    # ------------- Mock data (replace with backend) -------------
-
-    def _mock_alerts(self):
-        return [
-            {
-                "id": "a1",
-                "type": "Low Stock Warning",
-                "product": "Wireless Mouse",
-                "message": "Wireless Mouse stock has dropped below minimum threshold (5 units remaining).",
-                "icon": ft.Icons.WARNING_AMBER,
-                "severity": "critical",
-                "time": "2 hours ago",
-            },
-            {
-                "id": "a2",
-                "type": "Demand Spike Prediction",
-                "product": "Monitor Arms",
-                "message": "Monitor Arms expected to see 45% increase in demand over next 2 weeks.",
-                "icon": ft.Icons.SHOW_CHART,
-                "severity": "warning",
-                "time": "4 hours ago",
-            },
-            {
-                "id": "a3",
-                "type": "Overstock Alert",
-                "product": "Keyboard Cases",
-                "message": "Keyboard Cases inventory is 3x above optimal level (156 units).",
-                "icon": ft.Icons.INVENTORY_2,
-                "severity": "warning",
-                "time": "5 hours ago",
-            },
-            {
-                "id": "a4",
-                "type": "Low Stock Warning",
-                "product": "USB Cable",
-                "message": "USB Cable inventory below reorder point (12 units remaining).",
-                "icon": ft.Icons.WARNING,
-                "severity": "critical",
-                "time": "1 hour ago",
-            },
-            {
-                "id": "a5",
-                "type": "Stock Mismatch Detected",
-                "product": "Desk Lamp",
-                "message": "Potential discrepancy in Desk Lamp count - physical audit recommended.",
-                "icon": ft.Icons.ERROR_OUTLINE,
-                "severity": "critical",
-                "time": "6 hours ago",
-            },
-        ]
-
+        if self.alerts.loaded:
+            self._search.submit(*self._current_filters(), delay=0)
+
+    def _current_filters(self) -> tuple:
+        """Snapshot of (search, severity, type); None = any."""
+        severity = self.severity_dropdown.value
+        alert_type = self.type_dropdown.value
+        return (
+            self.search_field.value or "",
+            None if severity in (None, "all") else severity,
+            None if alert_type in (None, "all") else alert_type,
+        )
 
+    def _add_type_options(self, alert_types):
+        known = {option.key for option in self.type_dropdown.options}
+        for alert_type in sorted(set(alert_types) - known):
+            self.type_dropdown.options.append(ft.dropdown.Option(alert_type))
+
+    def _query_alerts(
+        self, query: str, severity: str | None, alert_type: str | None
+    ) -> list[Alert]:
+        return self.store.query(search=query, severity=severity, type=alert_type)
+
+    def _show_alerts(self):
+        """
+        Render the session's alerts with the current filters; runs on the
+        page loop after they load or change, followed by one page.update().
+        """
+        self._add_type_options(self.store.types())
+        self._update_summary()
+        self._render_alerts(self._query_alerts(*self._current_filters()))
+
+
+def _card_signature(alert: Alert) -> tuple:
+    return (
+        alert.type,
+        alert.severity,
+        alert.product,
+        alert.message,
+        alert.resolved,
+        alert.count,
+    )
@@ -2,6 +2,19 @@ import flet as ft
 from flet.canvas import Canvas, Arc
 from flet import Paint, PaintingStyle
 
+from services.alert_feed import start_alert_feed
+from services.event_bus import STOCK_TOPIC, UpdateBatcher
+from services.inventory_repository import get_inventory_repository
+
+# KPI cards that show live stock status counts: card key -> status. They
+# count SKUs per status, not alerts: the Overstock Alert rule fires at
+# 1.5x the optimal level, below the overstock ceiling.
+_STOCK_KPIS = {
+    "low": "Low",
+    "overstock": "Overstock",
+    "dead": "Dead Stock",
+}
+
 
 class DashboardPage(ft.Column):
     def __init__(self, page: ft.Page):
@@ -20,12 +33,29 @@ class DashboardPage(ft.Column):
         self.slow = 32
         self.dead = 10
 
+        # Value texts of the live KPI cards, by card key
+        self.repo = get_inventory_repository()
+        self._kpi_values: dict[str, ft.Text] = {}
+
         self.controls = [
             self._top_bar(),
             self._header_section(),
             self._kpi_section(),
             self._charts_section(),
         ]
+        self._update_stock_kpis()
+
+        # Stock updates from every session are pushed; bursts arrive once
+        # per frame
+        start_alert_feed()
+        self._batcher = UpdateBatcher.for_page(page)
+        self._batcher.listen(STOCK_TOPIC, self._on_stock_updates)
+
+    # ---------------- Lifecycle ----------------
+
+    def dispose(self):
+        """Stop listening to shared services; the screen cache dropped it."""
+        self._batcher.unlisten(STOCK_TOPIC, self._on_stock_updates)
 
     # ---------------- Top bar ----------------
 
@@ -132,6 +162,7 @@ class DashboardPage(ft.Column):
                     icon=ft.Icons.ARROW_DOWNWARD,
                     icon_color="#FBBF24",  # AMBER_300
                     value="12",
+                    key="low",
                     title="Low stock items",
                     subtitle="+3 from last week",
                     chip_text="Restock",
@@ -142,7 +173,8 @@ class DashboardPage(ft.Column):
                     icon=ft.Icons.INVENTORY_2_OUTLINED,
                     icon_color="#A5B4FC",  # INDIGO_300
                     value="5",
-                    title="Overstock alerts",
+                    key="overstock",
+                    title="Overstock items",
                     subtitle="-2 from last week",
                     chip_text="Review",
                     chip_color="#6366F1",
@@ -152,6 +184,7 @@ class DashboardPage(ft.Column):
                     icon=ft.Icons.REPORT_GMAILERRORRED,
                     icon_color="#FCA5A5",  # RED_300
                     value="8",
+                    key="dead",
                     title="Dead stock items",
                     subtitle="No change",
                     chip_text="Liquidate",
@@ -221,7 +254,16 @@ class DashboardPage(ft.Column):
         chip_text: str,
         chip_color,
         col,
+        key: str | None = None,
     ) -> ft.Control:
+        value_text = ft.Text(
+            value,
+            size=22,
+            weight=ft.FontWeight.BOLD,
+            color="#F9FAFB",
+        )
+        if key is not None:
+            self._kpi_values[key] = value_text
         return ft.Container(
             col=col,
             padding=16,
@@ -247,12 +289,7 @@ class DashboardPage(ft.Column):
                             ),
                         ],
                     ),
-                    ft.Text(
-                        value,
-                        size=22,
-                        weight=ft.FontWeight.BOLD,
-                        color="#F9FAFB",
-                    ),
+                    value_text,
                     ft.Text(
                         title,
                         size=13,
@@ -267,6 +304,15 @@ class DashboardPage(ft.Column):
             ),
         )
 
+    def _update_stock_kpis(self):
+        counts = self.repo.facet_counts()["status"]
+        for key, status in _STOCK_KPIS.items():
+            self._kpi_values[key].value = f"{counts.get(status, 0):,}"
+
+    def _on_stock_updates(self, updates: list):
+        # Bitmap popcounts, so one refresh per frame whatever the burst size
+        self._update_stock_kpis()
+
     # ---------------- Charts section ----------------
 
     def _charts_section(self) -> ft.Control:
@@ -1,5 +1,31 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
 import flet as ft
 
+from services.alert_feed import start_alert_feed
+from services.debounced_search import DebouncedSearch
+from services.event_bus import STOCK_TOPIC, UpdateBatcher
+from services.inventory_repository import StockUpdate, get_inventory_repository
+from services.product import Product, Status, format_relative
+from services.product_import import import_products
+from services.relative_time import RelativeTimeTicker
+from services.write_behind import WriteBehindQueue
+
+
+# The table is windowed: only rows near the viewport exist as controls, the
+# rest of the result list is represented by two spacers.
+TABLE_VIEWPORT_HEIGHT = 480
+ROW_HEIGHT = 60
+ROW_EXTENT = ROW_HEIGHT + 6  # row + bottom margin
+WINDOW_PAGE_SIZE = 20  # rows are fetched in pages of this size
+OVERSCAN_ROWS = 10
+
+# Built row controls kept per product id, reused while the product is unchanged
+ROW_CACHE_SIZE = 200
+
 
 class InventoryPage(ft.Column):
     def __init__(self, page: ft.Page):
@@ -10,8 +36,8 @@ class InventoryPage(ft.Column):
         )
         self.page = page
 
-        # In real app, these will be loaded from Firestore / API
-        self.items = self._mock_items()
+        # Catalog lives in the local SQLite store; the page only queries it
+        self.repo = get_inventory_repository()
 
         self.search_field = ft.TextField(
             hint_text="Search products or categories...",
@@ -27,8 +53,118 @@ class InventoryPage(ft.Column):
         )
 
         self.table_column = ft.Column(
-            spacing=8,
+            spacing=0,
+            height=TABLE_VIEWPORT_HEIGHT,
             scroll=ft.ScrollMode.AUTO,
+            on_scroll_interval=50,
+            on_scroll=self._on_table_scroll,
+        )
+
+        # The current result is paged in with keyset cursors: the filters it
+        # was queried with, the ids loaded so far (in order), the cursor for
+        # the next page (None once all are loaded), its total size and the
+        # [start, end) slice of it that is rendered
+        self._result_filters: tuple = ("", None, None, "name", False)
+        self._result_ids: list[int] = []
+        self._cursor: tuple | None = None
+        self._total = 0
+        self._window = (0, 0)
+        self._facets: dict[str, dict[str, int]] = {"category": {}, "status": {}}
+
+        # Active sort column / direction and the header labels showing it
+        self._sort = "name"
+        self._descending = False
+        self._sort_labels: dict[str, tuple[ft.Text, str]] = {}
+
+        # product id -> (row signature, row control)
+        self._row_cache: "OrderedDict[int, tuple[_RowSignature, ft.Control]]" = (
+            OrderedDict()
+        )
+        # Multi-select: ids of checked products (may include rows off screen)
+        self._selected: set[int] = set()
+        self.select_all_checkbox = ft.Checkbox(
+            tooltip="Select all results",
+            on_change=self._on_select_all,
+        )
+        self.selection_text = ft.Text("", size=12, color="#F9FAFB")
+        self.bulk_bar = self._bulk_bar()
+
+        self._top_spacer = ft.Container(height=0)
+        self._bottom_spacer = ft.Container(height=0)
+        self._empty_state = self._empty_table()
+
+        self._search = DebouncedSearch(
+            page=page,
+            query=self._query_results,
+            render=self._on_search_results,
+        )
+
+        # Status is derived by the repository; stock updates from every
+        # session are pushed to the page loop a frame at a time. This page's
+        # own writes carry its origin token, as it re-renders after them
+        # by itself.
+        self._origin = object()
+        start_alert_feed()
+        self._batcher = UpdateBatcher.for_page(page)
+        self._batcher.listen(STOCK_TOPIC, self._on_stock_updates)
+
+        # Inline Qty edits are shown at once and written behind: unsaved
+        # values per product id, the stored value to roll back to, and the
+        # ids whose last save failed (their rows show an error badge)
+        self._edits: dict[int, int] = {}
+        self._rollback: dict[int, int] = {}
+        self._failed: set[int] = set()
+        self._quantity_writes = WriteBehindQueue(
+            page=page,
+            write=self._write_quantities,
+            on_done=self._on_quantities_saved,
+            on_error=self._on_quantities_failed,
+        )
+
+        # "Last updated" labels of the rendered rows advance with the
+        # session's shared ticker while the screen is shown
+        self._ticker = RelativeTimeTicker.for_page(page)
+
+        # Bulk import (CSV / XLSX); the picker joins page.overlay on first use
+        self._file_picker = ft.FilePicker(on_result=self._on_import_file_picked)
+
+        # Filter dropdowns; option labels carry live facet counts
+        self.status_dropdown = ft.Dropdown(
+            label="Status",
+            dense=True,
+            border_radius=20,
+            bgcolor="#020617",
+            options=[
+                ft.dropdown.Option("All"),
+                ft.dropdown.Option("Low"),
+                ft.dropdown.Option("OK"),
+                ft.dropdown.Option("Overstock"),
+                ft.dropdown.Option("Dead Stock"),
+            ],
+            value="All",
+            on_change=self._on_filter_change,
+        )
+        self.category_dropdown = ft.Dropdown(
+            label="Category",
+            dense=True,
+            border_radius=20,
+            bgcolor="#020617",
+            options=[
+                ft.dropdown.Option("All"),
+                ft.dropdown.Option("Electronics"),
+                ft.dropdown.Option("Furniture"),
+                ft.dropdown.Option("Accessories"),
+                ft.dropdown.Option("Lighting"),
+                ft.dropdown.Option("Stationery"),
+            ],
+            value="All",
+            on_change=self._on_filter_change,
+        )
+
+        self.count_text = ft.Text(
+            "",
+            size=11,
+            color="#6B7280",  # GREY_500
         )
 
         self.controls = [
@@ -37,7 +173,22 @@ class InventoryPage(ft.Column):
             self._table_card(),
         ]
 
-        self._render_table(self.items)
+        self._refresh_results()
+        self._render_table()
+
+    # ---------------- Lifecycle ----------------
+
+    def did_mount(self):
+        self._ticker.register(self._visible_times)
+
+    def will_unmount(self):
+        self._ticker.unregister(self._visible_times)
+
+    def dispose(self):
+        """Stop listening to shared services; the screen cache dropped it."""
+        self._batcher.unlisten(STOCK_TOPIC, self._on_stock_updates)
+        self._ticker.unregister(self._visible_times)
+        self._search.cancel()
 
     # ---------------- Top bar ----------------
 
@@ -124,40 +275,11 @@ class InventoryPage(ft.Column):
                             ),
                             ft.Container(
                                 col={"xs": 6, "md": 2},
-                                content=ft.Dropdown(
-                                    label="Status",
-                                    dense=True,
-                                    border_radius=20,
-                                    bgcolor="#020617",
-                                    options=[
-                                        ft.dropdown.Option("All"),
-                                        ft.dropdown.Option("Low"),
-                                        ft.dropdown.Option("OK"),
-                                        ft.dropdown.Option("Overstock"),
-                                        ft.dropdown.Option("Dead Stock"),
-                                    ],
-                                    value="All",
-                                    on_change=self._on_filter_change,
-                                ),
+                                content=self.status_dropdown,
                             ),
                             ft.Container(
                                 col={"xs": 6, "md": 2},
-                                content=ft.Dropdown(
-                                    label="Category",
-                                    dense=True,
-                                    border_radius=20,
-                                    bgcolor="#020617",
-                                    options=[
-                                        ft.dropdown.Option("All"),
-                                        ft.dropdown.Option("Electronics"),
-                                        ft.dropdown.Option("Furniture"),
-                                        ft.dropdown.Option("Accessories"),
-                                        ft.dropdown.Option("Lighting"),
-                                        ft.dropdown.Option("Stationery"),
-                                    ],
-                                    value="All",
-                                    on_change=self._on_filter_change,
-                                ),
+                                content=self.category_dropdown,
                             ),
                             ft.Container(
                                 col={"xs": 12, "md": 2},
@@ -195,14 +317,12 @@ class InventoryPage(ft.Column):
                                 size=16,
                                 weight=ft.FontWeight.BOLD,
                             ),
-                            ft.Text(
-                                f"{len(self.items)} items",
-                                size=11,
-                                color="#6B7280",  # GREY_500
-                            ),
+                            self.count_text,
                         ],
                     ),
                     ft.Divider(height=1, color="#1E293B"),
+                    self.bulk_bar,
+                    self._table_header(),
                     ft.Container(
                         expand=True,
                         content=self.table_column,
@@ -213,39 +333,115 @@ class InventoryPage(ft.Column):
 
     # ---------------- Table rendering ----------------
 
-    def _render_table(self, items):
-        self.table_column.controls.clear()
+    def _render_table(self):
+        """
+        Point the table at the current window. Rows are keyed by product id
+        and reused when unchanged, so the client diff only carries the rows
+        that were inserted, removed or edited.
+        """
+        if not self._total:
+            self.table_column.controls = [self._empty_state]
+            return
 
-        # Header
-        self.table_column.controls.append(self._table_header())
+        start, end = self._window
+        self._load_until(end)
+        self._top_spacer.height = start * ROW_EXTENT
+        self._bottom_spacer.height = (self._total - end) * ROW_EXTENT
+        rows = [
+            self._keyed_row(item)
+            for item in self.repo.get_many(self._result_ids[start:end])
+        ]
+        self.table_column.controls = [self._top_spacer, *rows, self._bottom_spacer]
 
-        if not items:
-            self.table_column.controls.append(
-                ft.Container(
-                    padding=24,
-                    border_radius=12,
-                    bgcolor="#020617",
-                    content=ft.Row(
-                        alignment=ft.MainAxisAlignment.CENTER,
-                        controls=[
-                            ft.Icon(
-                                ft.Icons.INVENTORY_2_OUTLINED,
-                                color="#4B5563",  # GREY_600
-                            ),
-                            ft.Text(
-                                "No products match your filters.",
-                                size=13,
-                                color="#9CA3AF",  # GREY_400
-                            ),
-                        ],
-                    ),
-                )
+        # Rows of the current window were just touched, so they are never
+        # the ones evicted
+        while len(self._row_cache) > ROW_CACHE_SIZE:
+            self._row_cache.popitem(last=False)
+
+        # no update() here; page.update() is called after actions
+
+    def _load_until(self, n: int):
+        """Fetch pages of the result until its first `n` ids are loaded."""
+        search, category, status, sort, descending = self._result_filters
+        while len(self._result_ids) < n and self._cursor is not None:
+            wanted = n - len(self._result_ids)
+            ids, self._cursor = self.repo.query_page(
+                search=search,
+                category=category,
+                status=status,
+                sort=sort,
+                descending=descending,
+                after=self._cursor,
+                limit=wanted + -wanted % WINDOW_PAGE_SIZE,
             )
+            self._result_ids.extend(ids)
+
+    def _keyed_row(self, item: Product) -> ft.Control:
+        if item.id in self._edits:
+            # Not saved yet; keep showing the edited value
+            item.quantity = self._edits[item.id]
+        signature = _row_signature(item)
+        cached_signature, row = self._row_cache.get(item.id, (None, None))
+        if cached_signature == signature:
+            self._row_cache.move_to_end(item.id)
         else:
-            for item in items:
-                self.table_column.controls.append(self._inventory_row(item))
+            row = self._inventory_row(item)
+            self._row_cache[item.id] = (signature, row)
+            self._row_cache.move_to_end(item.id)
+        # Unchanged values produce no diff
+        row.data.checkbox.value = item.id in self._selected
+        row.data.error_badge.visible = item.id in self._failed
+        row.data.updated.value = format_relative(item.updated)
+        return row
 
-        # no update() here; page.update() is called after actions
+    def _visible_times(self):
+        """Ticker source: the "Last updated" label of every rendered row."""
+        for row in self.table_column.controls:
+            if isinstance(row.data, _RowCells):
+                cached = self._row_cache.get(row.data.checkbox.data)
+                if cached is not None:
+                    signature, _ = cached
+                    yield row.data.updated, signature.updated
+
+    def _empty_table(self) -> ft.Control:
+        return ft.Container(
+            padding=24,
+            border_radius=12,
+            bgcolor="#020617",
+            content=ft.Row(
+                alignment=ft.MainAxisAlignment.CENTER,
+                controls=[
+                    ft.Icon(
+                        ft.Icons.INVENTORY_2_OUTLINED,
+                        color="#4B5563",  # GREY_600
+                    ),
+                    ft.Text(
+                        "No products match your filters.",
+                        size=13,
+                        color="#9CA3AF",  # GREY_400
+                    ),
+                ],
+            ),
+        )
+
+    def _window_for(self, pixels: float) -> tuple[int, int]:
+        """Page-aligned slice covering the viewport at `pixels` plus overscan."""
+        total = self._total
+        first = int(max(pixels, 0) // ROW_EXTENT)
+        visible = TABLE_VIEWPORT_HEIGHT // ROW_EXTENT + 1
+        start = max(first - OVERSCAN_ROWS, 0)
+        start -= start % WINDOW_PAGE_SIZE
+        end = first + visible + OVERSCAN_ROWS
+        end += -end % WINDOW_PAGE_SIZE
+        return min(start, total), min(end, total)
+
+    def _on_table_scroll(self, e: ft.OnScrollEvent):
+        window = self._window_for(e.pixels)
+        if window == self._window:
+            return
+        self._window = window
+        self._render_table()
+        self.table_column.update()
 
     def _table_header(self) -> ft.Control:
         return ft.Container(
@@ -255,32 +451,104 @@ class InventoryPage(ft.Column):
                 alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                 vertical_alignment=ft.CrossAxisAlignment.CENTER,
                 controls=[
-                    self._header_cell("Product name"),
-                    self._header_cell("Category"),
-                    self._header_cell("Qty", align_end=True, fixed_width=70),
-                    self._header_cell("Status", fixed_width=110),
-                    self._header_cell("Last updated", fixed_width=110),
+                    ft.Container(width=40, content=self.select_all_checkbox),
+                    self._header_cell("Product name", sort_key="name"),
+                    self._header_cell("Category", sort_key="category"),
+                    self._header_cell(
+                        "Qty", align_end=True, fixed_width=70, sort_key="quantity"
+                    ),
+                    self._header_cell("Status", fixed_width=110, sort_key="status"),
+                    self._header_cell(
+                        "Last updated", fixed_width=110, sort_key="updated"
+                    ),
                     self._header_cell("", fixed_width=70),
                 ],
             ),
         )
 
     def _header_cell(
-        self, label: str, align_end: bool = False, fixed_width: int | None = None
+        self,
+        label: str,
+        align_end: bool = False,
+        fixed_width: int | None = None,
+        sort_key: str | None = None,
     ) -> ft.Control:
+        text = ft.Text(
+            label,
+            size=11,
+            weight=ft.FontWeight.W_600,
+            color="#6B7280",  # GREY_500
+        )
+        if sort_key is not None:
+            self._sort_labels[sort_key] = (text, label)
+            self._style_sort_label(sort_key)
         return ft.Container(
             width=fixed_width,
             alignment=ft.alignment.center_right if align_end else ft.alignment.center_left,
-            content=ft.Text(
-                label,
-                size=11,
-                weight=ft.FontWeight.W_600,
-                color="#6B7280",  # GREY_500
-            ),
+            content=text,
+            on_click=(lambda e, k=sort_key: self._on_sort_click(k))
+            if sort_key is not None
+            else None,
         )
 
-    def _inventory_row(self, item: dict) -> ft.Control:
+    def _style_sort_label(self, sort_key: str):
+        text, label = self._sort_labels[sort_key]
+        if sort_key == self._sort:
+            text.value = f"{label} {'↓' if self._descending else '↑'}"
+            text.color = "#F9FAFB"
+        else:
+            text.value = label
+            text.color = "#6B7280"  # GREY_500
+
+    def _on_sort_click(self, sort_key: str):
+        previous = self._sort
+        if sort_key == previous:
+            self._descending = not self._descending
+        else:
+            self._sort = sort_key
+            self._descending = False
+        self._style_sort_label(previous)
+        self._style_sort_label(sort_key)
+        self._search.submit(*self._current_filters(), delay=0)
+
+    def _inventory_row(self, item: Product) -> ft.Control:
+        cells = _RowCells(
+            checkbox=ft.Checkbox(data=item.id, on_change=self._on_row_select),
+            quantity=ft.TextField(
+                value=str(item.quantity),
+                data=item.id,
+                width=56,
+                dense=True,
+                text_size=13,
+                color="#F9FAFB",
+                text_align=ft.TextAlign.RIGHT,
+                border=ft.InputBorder.NONE,
+                content_padding=0,
+                keyboard_type=ft.KeyboardType.NUMBER,
+                input_filter=ft.NumbersOnlyInputFilter(),
+                tooltip="Edit quantity",
+                on_submit=self._on_quantity_edit,
+                on_blur=self._on_quantity_edit,
+            ),
+            error_badge=ft.Icon(
+                ft.Icons.ERROR_OUTLINE,
+                size=14,
+                color="#EF4444",
+                visible=False,
+            ),
+            status=ft.Container(
+                content=self._status_chip(item.status),
+                width=110,
+            ),
+            updated=ft.Text(
+                format_relative(item.updated),
+                size=12,
+                color="#6B7280",
+            ),
+        )
         return ft.Container(
+            data=cells,
+            height=ROW_HEIGHT,
             padding=ft.padding.symmetric(vertical=10, horizontal=8),
             border_radius=10,
             bgcolor="#0F172A",
@@ -290,9 +558,10 @@ class InventoryPage(ft.Column):
                 alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                 vertical_alignment=ft.CrossAxisAlignment.CENTER,
                 controls=[
+                    ft.Container(width=40, content=cells.checkbox),
                     ft.Container(
                         content=ft.Text(
-                            item["name"],
+                            item.name,
                             size=14,
                             color="#F9FAFB",
                         ),
@@ -300,7 +569,7 @@ class InventoryPage(ft.Column):
                     ),
                     ft.Container(
                         content=ft.Text(
-                            item["category"],
+                            item.category,
                             size=13,
                             color="#D1D5DB",
                         ),
@@ -308,25 +577,15 @@ class InventoryPage(ft.Column):
                     ),
                     ft.Container(
                         alignment=ft.alignment.center_right,
-                        content=ft.Text(
-                            str(item["quantity"]),
-                            size=13,
-                            color="#F9FAFB",
-                        ),
-                        width=70,
-                    ),
-                    ft.Container(
-                        content=self._status_chip(item["status"]),
-                        width=110,
-                    ),
-                    ft.Container(
-                        content=ft.Text(
-                            item["updated"],
-                            size=12,
-                            color="#6B7280",
+                        content=ft.Row(
+                            spacing=2,
+                            alignment=ft.MainAxisAlignment.END,
+                            controls=[cells.error_badge, cells.quantity],
                         ),
-                        width=110,
+                        width=76,
                     ),
+                    cells.status,
+                    ft.Container(content=cells.updated, width=110),
                     ft.Row(
                         alignment=ft.MainAxisAlignment.END,
                         spacing=4,
@@ -335,13 +594,13 @@ class InventoryPage(ft.Column):
                                 icon=ft.Icons.EDIT_OUTLINED,
                                 icon_size=18,
                                 tooltip="Edit",
-                                on_click=lambda e, i=item: self._open_edit_dialog(i),
+                                on_click=lambda e, i=item.id: self._open_edit_dialog(i),
                             ),
                             ft.IconButton(
                                 icon=ft.Icons.DELETE_OUTLINE,
                                 icon_size=18,
                                 tooltip="Delete",
-                                on_click=lambda e, i=item: self._delete_item(i),
+                                on_click=lambda e, i=item.id: self._delete_item(i),
                             ),
                         ],
                     ),
@@ -349,12 +608,12 @@ class InventoryPage(ft.Column):
             ),
         )
 
-    def _status_chip(self, status: str) -> ft.Control:
+    def _status_chip(self, status: Status) -> ft.Control:
         colors = {
-            "Low": ("#FEE2E2", "#EF4444"),
-            "OK": ("#DCFCE7", "#22C55E"),
-            "Overstock": ("#FEF3C7", "#F59E0B"),
-            "Dead Stock": ("#E2E8F0", "#475569"),
+            Status.LOW: ("#FEE2E2", "#EF4444"),
+            Status.OK: ("#DCFCE7", "#22C55E"),
+            Status.OVERSTOCK: ("#FEF3C7", "#F59E0B"),
+            Status.DEAD_STOCK: ("#E2E8F0", "#475569"),
         }
         bg, text_color = colors.get(status, ("#E5E7EB", "#374151"))
         return ft.Container(
@@ -362,7 +621,7 @@ class InventoryPage(ft.Column):
             border_radius=20,
             bgcolor=bg,
             content=ft.Text(
-                status,
+                status.value,
                 size=12,
                 weight=ft.FontWeight.W_600,
                 color=text_color,
@@ -375,17 +634,130 @@ class InventoryPage(ft.Column):
         dlg = ft.AlertDialog(
             modal=True,
             title=ft.Text("Add product"),
-            content=ft.Text("Product creation form will go here."),
-            actions=[ft.TextButton("Close", on_click=lambda ev: self._close_dialog())],
+            content=ft.Column(
+                tight=True,
+                spacing=8,
+                controls=[
+                    ft.Text("Product creation form will go here."),
+                    ft.Text(
+                        "Onboarding a shop? Import a CSV or Excel file with "
+                        "name, category and quantity columns.",
+                        size=12,
+                        color="#9CA3AF",  # GREY_400
+                    ),
+                ],
+            ),
+            actions=[
+                ft.TextButton(
+                    "Import CSV / Excel",
+                    icon=ft.Icons.UPLOAD_FILE,
+                    on_click=self._pick_import_file,
+                ),
+                ft.TextButton("Close", on_click=lambda ev: self._close_dialog()),
+            ],
         )
         self.page.dialog = dlg
         dlg.open = True
         self.page.update()
 
-    def _open_edit_dialog(self, item: dict):
+    # ---------------- Bulk import ----------------
+
+    def _pick_import_file(self, e):
+        if self._file_picker not in self.page.overlay:
+            self.page.overlay.append(self._file_picker)
+            self.page.update()
+        self._file_picker.pick_files(
+            dialog_title="Import products",
+            allowed_extensions=["csv", "xlsx"],
+        )
+
+    def _on_import_file_picked(self, e: ft.FilePickerResultEvent):
+        if not e.files:
+            return
+        path = e.files[0].path
+        if not path:
+            # Web builds only get file names; the file would need uploading
+            self._show_snack("File import is available in the desktop app.")
+            return
+
+        progress_bar = ft.ProgressBar(value=0, width=320)
+        status_text = ft.Text("Starting import...", size=12, color="#9CA3AF")
+        cancel = threading.Event()
         dlg = ft.AlertDialog(
             modal=True,
-            title=ft.Text(f"Edit {item['name']}"),
+            title=ft.Text("Importing products"),
+            content=ft.Column(
+                tight=True,
+                spacing=10,
+                controls=[progress_bar, status_text],
+            ),
+            actions=[ft.TextButton("Cancel", on_click=lambda ev: cancel.set())],
+        )
+        self.page.dialog = dlg
+        dlg.open = True
+        self.page.update()
+        self.page.run_thread(
+            self._run_import, path, progress_bar, status_text, cancel
+        )
+
+    def _run_import(self, path, progress_bar, status_text, cancel):
+        def on_progress(report):
+            # Called once per batch, never per row
+            progress_bar.value = report["progress"]
+            status_text.value = (
+                f"{report['imported']:,} rows imported · "
+                f"{report['rows_per_second']:,.0f} rows/s"
+            )
+            self.page.update()
+
+        try:
+            report = import_products(
+                self.repo,
+                path,
+                on_progress=on_progress,
+                cancel=cancel,
+                origin=self._origin,
+            )
+        except Exception as ex:  # unreadable file, corrupt workbook, database error
+            report = None
+            failure = ex
+        finally:
+            # Nothing reads the Cancel button once this thread has stopped
+            self._close_dialog()
+
+        # Refresh the table once for the whole import; batches written
+        # before a failure are kept
+        self._refresh_results()
+        self._render_table()
+        if report is None:
+            self._show_snack(f"Import failed: {failure}")
+            return
+        message = (
+            f"Imported {report['imported']:,} products "
+            f"({report['inserted']:,} new, {report['updated']:,} updated) "
+            f"at {report['rows_per_second']:,.0f} rows/s"
+        )
+        if report["rejected"]:
+            message += f"; {report['rejected']:,} rows rejected"
+            if report["errors"]:
+                message += f" (first: {report['errors'][0]})"
+        if report["cancelled"]:
+            message = "Import cancelled. " + message
+        self._show_snack(message)
+
+    def _show_snack(self, message: str):
+        self.page.snack_bar = ft.SnackBar(content=ft.Text(message))
+        self.page.snack_bar.open = True
+        self.page.update()
+
+    def _open_edit_dialog(self, item_id: int):
+        # Rows outlive edits, so they only know the id
+        item = self.repo.get(item_id)
+        if item is None:
+            return
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(f"Edit {item.name}"),
             content=ft.Text("Product edit form will go here."),
             actions=[ft.TextButton("Close", on_click=lambda ev: self._close_dialog())],
         )
@@ -393,96 +765,483 @@ class InventoryPage(ft.Column):
         dlg.open = True
         self.page.update()
 
+    def _open_dialog(self, dlg: ft.AlertDialog):
+        self.page.dialog = dlg
+        dlg.open = True
+        self.page.update()
+
     def _close_dialog(self):
         if self.page.dialog:
             self.page.dialog.open = False
             self.page.update()
 
-    def _delete_item(self, item: dict):
-        # Remove item from list and refresh table
-        self.items = [i for i in self.items if i is not item]
-        self._render_table(self.items)
+    def _delete_item(self, item_id: int):
+        """
+        Delete one product by id. Only its row control is removed and the
+        counters are patched in place; the result list is not re-queried.
+        """
+        # The current record, not the one the row was built from: inline
+        # edits and pushed updates change status without rebuilding rows
+        item = self.repo.get(item_id)
+        if item is None or not self.repo.delete(item.id, origin=self._origin):
+            return
+        cached = self._row_cache.pop(item.id, None)
+        if item.id in self._selected:
+            self._selected.discard(item.id)
+            self._update_bulk_bar()
+
+        # The row is on screen, so its position is inside the window
+        start, end = self._window
+        try:
+            position = self._result_ids.index(item.id, start, end)
+        except ValueError:
+            position = None
+        if position is not None:
+            del self._result_ids[position]
+            self._total -= 1
+            # Rows after it shift up by one, so both spacers keep their height
+            self._window = (start, end - 1)
+            if cached is not None and cached[1] in self.table_column.controls:
+                self.table_column.controls.remove(cached[1])
+            # It matched every filter, so it counted once in each facet.
+            # Facets can trail a pushed update by a frame; that update's
+            # refresh recounts them.
+            for facet, value in (("category", item.category), ("status", item.status.value)):
+                if self._facets[facet].get(value, 0) > 0:
+                    self._facets[facet][value] -= 1
+            self._set_facet_counts(self.category_dropdown, self._facets["category"])
+            self._set_facet_counts(self.status_dropdown, self._facets["status"])
+            # Overscan absorbs deletes; once it is used up, top the window
+            # back up to its page boundary in one diff
+            short = -self._window[1] % WINDOW_PAGE_SIZE
+            if short >= OVERSCAN_ROWS or self._window[0] == self._window[1]:
+                self._window = (start, min(end - 1 + short, self._total))
+                self._render_table()
+
+        self.count_text.value = f"{self.repo.count()} items"
         self.page.update()
 
+    # ---------------- Inline quantity editing ----------------
+
+    def _on_quantity_edit(self, e: ft.ControlEvent):
+        """
+        Submit / blur of a Qty cell. The row already shows the new value;
+        the write is queued, and repeated edits of one SKU before the queue
+        flushes are written once.
+        """
+        field = e.control
+        item_id = field.data
+        cached = self._row_cache.get(item_id)
+        if cached is None:
+            return
+        signature, row = cached
+        shown = signature.quantity
+        try:
+            quantity = int((field.value or "").strip())
+        except ValueError:
+            field.value = str(shown)
+            field.update()
+            return
+        if quantity == shown:
+            return
+
+        if item_id not in self._edits:
+            self._rollback[item_id] = shown
+        self._edits[item_id] = quantity
+        # The cached row now matches the edited product, so re-renders
+        # before the flush reuse it
+        self._row_cache[item_id] = (signature._replace(quantity=quantity), row)
+        if item_id in self._failed:
+            self._failed.discard(item_id)
+            row.data.error_badge.visible = False
+            row.data.error_badge.update()
+        self._quantity_writes.put(item_id, quantity)
+
+    def _write_quantities(self, batch: dict[int, int]):
+        # Worker thread; the rows are patched by the callbacks below
+        self.repo.set_quantities(batch, origin=self._origin)
+
+    def _on_quantities_saved(self, batch: dict[int, int]):
+        for item_id, quantity in batch.items():
+            if self._edits.get(item_id) == quantity:
+                del self._edits[item_id]
+                self._rollback.pop(item_id, None)
+            elif item_id in self._edits:
+                # Edited again meanwhile; this value is now the stored one
+                self._rollback[item_id] = quantity
+
+        # Status and "updated" changed with the save; patch those cells in
+        # place so a Qty field being typed in is not rebuilt
+        for item in self.repo.get_many([i for i in batch if i in self._row_cache]):
+            if item.id in self._edits:
+                item.quantity = self._edits[item.id]
+            signature, row = self._row_cache[item.id]
+            row.data.status.content = self._status_chip(item.status)
+            row.data.updated.value = format_relative(item.updated)
+            self._row_cache[item.id] = (_row_signature(item), row)
+
+        # Status filter and facet counts may have changed too
+        self._requery()
+
+    def _on_quantities_failed(self, batch: dict[int, int], ex: Exception):
+        reverted = 0
+        for item_id, quantity in batch.items():
+            if self._edits.get(item_id) != quantity:
+                continue  # a newer edit is queued and decides the outcome
+            del self._edits[item_id]
+            stored = self._rollback.pop(item_id)
+            self._failed.add(item_id)
+            reverted += 1
+            cached = self._row_cache.get(item_id)
+            if cached is not None:
+                signature, row = cached
+                row.data.quantity.value = str(stored)
+                row.data.error_badge.visible = True
+                row.data.error_badge.tooltip = f"Not saved: {ex}"
+                self._row_cache[item_id] = (signature._replace(quantity=stored), row)
+        if self.page is not None:  # off screen, the rows keep their error badges
+            self._show_snack(f"Could not save {reverted:,} quantity change(s): {ex}")
+
+    # ---------------- Multi-select / bulk actions ----------------
+
+    def _bulk_bar(self) -> ft.Control:
+        return ft.Container(
+            visible=False,
+            padding=ft.padding.symmetric(vertical=6, horizontal=10),
+            border_radius=10,
+            bgcolor="#111827",
+            content=ft.Row(
+                spacing=8,
+                vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                controls=[
+                    self.selection_text,
+                    ft.Container(expand=True),
+                    ft.TextButton(
+                        "Adjust qty",
+                        icon=ft.Icons.EXPOSURE_OUTLINED,
+                        on_click=self._open_bulk_quantity_dialog,
+                    ),
+                    ft.TextButton(
+                        "Re-categorise",
+                        icon=ft.Icons.CATEGORY_OUTLINED,
+                        on_click=self._open_bulk_category_dialog,
+                    ),
+                    ft.TextButton(
+                        "Delete",
+                        icon=ft.Icons.DELETE_OUTLINE,
+                        style=ft.ButtonStyle(color="#EF4444"),
+                        on_click=self._confirm_bulk_delete,
+                    ),
+                    ft.IconButton(
+                        icon=ft.Icons.CLOSE,
+                        icon_size=18,
+                        tooltip="Clear selection",
+                        on_click=self._clear_selection,
+                    ),
+                ],
+            ),
+        )
+
+    def _update_bulk_bar(self):
+        n = len(self._selected)
+        self.bulk_bar.visible = n > 0
+        self.selection_text.value = f"{n:,} selected"
+        self.select_all_checkbox.value = n > 0 and n == self._total
+
+    def _on_row_select(self, e: ft.ControlEvent):
+        if e.control.value:
+            self._selected.add(e.control.data)
+        else:
+            self._selected.discard(e.control.data)
+        self._update_bulk_bar()
+        self.page.update()
+
+    def _on_select_all(self, e: ft.ControlEvent):
+        if e.control.value:
+            # Includes the pages not loaded yet
+            self._selected = self.repo.match_ids(*self._result_filters[:3])
+        else:
+            self._selected = set()
+        self._sync_selection()
+
+    def _clear_selection(self, e=None):
+        self._selected = set()
+        self._sync_selection()
+
+    def _sync_selection(self):
+        # Only the rendered rows have checkboxes to flip
+        for row in self.table_column.controls:
+            if isinstance(row.data, _RowCells):
+                checkbox = row.data.checkbox
+                checkbox.value = checkbox.data in self._selected
+        self._update_bulk_bar()
+        self.page.update()
+
+    def _confirm_bulk_delete(self, e):
+        n = len(self._selected)
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(f"Delete {n:,} products?"),
+            content=ft.Text("This cannot be undone."),
+            actions=[
+                ft.TextButton("Cancel", on_click=lambda ev: self._close_dialog()),
+                ft.FilledButton(
+                    "Delete",
+                    style=ft.ButtonStyle(bgcolor="#EF4444"),
+                    on_click=lambda ev: self._apply_bulk(
+                        lambda ids: self.repo.delete_many(ids, origin=self._origin)
+                    ),
+                ),
+            ],
+        )
+        self._open_dialog(dlg)
+
+    def _open_bulk_quantity_dialog(self, e):
+        delta_field = ft.TextField(
+            label="Change quantity by",
+            hint_text="e.g. 10 or -5",
+            keyboard_type=ft.KeyboardType.NUMBER,
+            autofocus=True,
+        )
+
+        def apply(ev):
+            try:
+                delta = int(delta_field.value.strip())
+            except (AttributeError, ValueError):
+                delta_field.error_text = "Enter a whole number"
+                delta_field.update()
+                return
+            self._apply_bulk(
+                lambda ids: self.repo.adjust_quantity(ids, delta, origin=self._origin)
+            )
+
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(f"Adjust quantity of {len(self._selected):,} products"),
+            content=delta_field,
+            actions=[
+                ft.TextButton("Cancel", on_click=lambda ev: self._close_dialog()),
+                ft.FilledButton("Apply", on_click=apply),
+            ],
+        )
+        self._open_dialog(dlg)
+
+    def _open_bulk_category_dialog(self, e):
+        category_field = ft.Dropdown(
+            label="Move to category",
+            options=[ft.dropdown.Option(c) for c in self.repo.categories()],
+        )
+        new_field = ft.TextField(label="Or a new category")
+
+        def apply(ev):
+            category = (new_field.value or "").strip() or category_field.value
+            if not category:
+                new_field.error_text = "Pick or enter a category"
+                new_field.update()
+                return
+            self._apply_bulk(
+                lambda ids: self.repo.update_many(
+                    ids, origin=self._origin, category=category, updated=time.time()
+                )
+            )
+
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(f"Re-categorise {len(self._selected):,} products"),
+            content=ft.Column(
+                tight=True,
+                spacing=10,
+                controls=[category_field, new_field],
+            ),
+            actions=[
+                ft.TextButton("Cancel", on_click=lambda ev: self._close_dialog()),
+                ft.FilledButton("Apply", on_click=apply),
+            ],
+        )
+        self._open_dialog(dlg)
+
+    def _apply_bulk(self, action):
+        """
+        Run `action(ids)` (one repository transaction, tagged with this
+        page's origin) on the selection, then send the dialog close and the
+        table diff in a single page update.
+        """
+        action(list(self._selected))
+        self._selected = set()
+        # Edited rows fail their cached signature and are rebuilt; the rest
+        # of the window is reused
+        self._refresh_results(keep_window=True)
+        self._render_table()
+        self._update_bulk_bar()
+        if self.page.dialog:
+            self.page.dialog.open = False
+        self.page.update()
+
+    def _on_stock_updates(self, updates: list[StockUpdate]):
+        """
+        A frame's worth of stock updates, on the page loop. Status changes
+        made elsewhere (another session, a threshold change) move chips, the
+        status filter and facet counts, quantity writes to rendered rows
+        change their cells, and deletes drop rows and counts. All of them
+        re-query in the background (see _requery); keyed rows mean only the
+        affected rows are re-sent.
+        """
+        rendered = {
+            row.data.checkbox.data
+            for row in self.table_column.controls
+            if isinstance(row.data, _RowCells)
+        }
+        if not any(
+            update.origin is not self._origin
+            and (
+                update.changes
+                or update.removed
+                or not rendered.isdisjoint(update.item_ids)
+            )
+            for update in updates
+        ):
+            return
+        self._requery()
+
     # ---------------- Filters / search ----------------
 
+    def _set_facet_counts(self, dropdown: ft.Dropdown, counts: dict[str, int]):
+        """Show `Value (n)` on each option; values new to the catalog get one."""
+        known = {option.key for option in dropdown.options}
+        for value in sorted(counts):
+            if value not in known:
+                dropdown.options.append(ft.dropdown.Option(value))
+        for option in dropdown.options:
+            if option.key == "All":
+                n = sum(counts.values())
+            else:
+                n = counts.get(option.key, 0)
+            option.text = f"{option.key} ({n})"
+
     def _on_search_change(self, e: ft.ControlEvent):
         self._apply_filters()
 
     def _on_filter_change(self, e: ft.ControlEvent):
-        self._apply_filters()
+        self._search.submit(*self._current_filters(), delay=0)
 
     def _apply_filters(self):
-        q = (self.search_field.value or "").lower()
-        filtered = [
-            i
-            for i in self.items
-            if q in i["name"].lower()
-            or q in i["category"].lower()
-            or q in i["status"].lower()
-        ]
-        self._render_table(filtered)
-        self.page.update()
+        # Debounced; the query runs off the UI loop and only the latest
+        # result is rendered
+        self._search.submit(*self._current_filters())
+
+    def _current_filters(self) -> tuple:
+        """Snapshot of (search, category, status, sort, descending)."""
+        category = self.category_dropdown.value
+        status = self.status_dropdown.value
+        return (
+            self.search_field.value or "",
+            None if category in (None, "All") else category,
+            None if status in (None, "All") else status,
+            self._sort,
+            self._descending,
+        )
+
+    def _query_results(
+        self,
+        q: str,
+        category: str | None,
+        status: str | None,
+        sort: str,
+        descending: bool,
+    ):
+        # Only the first page of ids; the rest is fetched as the table scrolls
+        return (
+            (q, category, status, sort, descending),
+            self.repo.query_page(
+                search=q,
+                category=category,
+                status=status,
+                sort=sort,
+                descending=descending,
+                limit=WINDOW_PAGE_SIZE,
+            ),
+            self.repo.count(search=q, category=category, status=status),
+            self.repo.facet_counts(search=q, category=category, status=status),
+        )
+
+    def _on_search_results(self, results):
+        # A re-query of the filters on show keeps the scroll position;
+        # anything else starts from the top
+        keep_window = results[0] == self._result_filters
+        self._show_results(*results, keep_window=keep_window)
+        self._render_table()
+        if not keep_window and self.page is not None:  # None while cached off screen
+            self.table_column.scroll_to(offset=0)
+
+    def _requery(self):
+        """
+        Re-run the current query after a write, off the page loop like a
+        search: at 100k SKUs a broad search costs a few hundred ms, and
+        every session shares the loop. It supersedes a pending search,
+        whose filters it already uses.
+        """
+        self._search.submit(*self._current_filters(), delay=0)
+
+    def _refresh_results(self, keep_window: bool = False):
+        self._show_results(
+            *self._query_results(*self._current_filters()), keep_window=keep_window
+        )
+
+    def _show_results(
+        self,
+        filters: tuple,
+        first_page: tuple[list[int], tuple | None],
+        total: int,
+        facets: dict,
+        keep_window: bool = False,
+    ):
+        self._result_filters = filters
+        self._result_ids, self._cursor = first_page
+        self._total = total
+        self._facets = facets
+        if self._selected:
+            # Bulk actions only apply to products the table can show
+            self._selected &= self.repo.match_ids(*filters[:3])
+            self._update_bulk_bar()
+        self._set_facet_counts(self.category_dropdown, facets["category"])
+        self._set_facet_counts(self.status_dropdown, facets["status"])
+        self.count_text.value = f"{self.repo.count()} items"
+        if keep_window:
+            # Pages up to the window end are re-fetched when it is rendered
+            start, end = self._window
+            self._window = (min(start, total), min(end, total))
+        else:
+            self._window = self._window_for(0)
+
+
+class _RowCells:
+    """Controls of one table row that are updated in place (`row.data`)."""
+
+    __slots__ = ("checkbox", "quantity", "error_badge", "status", "updated")
+
+    def __init__(self, checkbox, quantity, error_badge, status, updated):
+        self.checkbox = checkbox
+        self.quantity = quantity
+        self.error_badge = error_badge
+        self.status = status
+        self.updated = updated
+
+
+class _RowSignature(NamedTuple):
+    """What a cached row shows; a row is rebuilt when this changes."""
+
+    name: str
+    category: str
+    quantity: int
+    status: Status
+    updated: float
 
-    # ---------------- Mock data (replace with backend) ----------------
-
-    def _mock_items(self):
-        return [
-            {
-                "name": "Wireless Mouse",
-                "category": "Electronics",
-                "quantity": 5,
-                "status": "Low",
-                "updated": "2 hours ago",
-            },
-            {
-                "name": "Ergonomic Chair",
-                "category": "Furniture",
-                "quantity": 45,
-                "status": "OK",
-                "updated": "1 day ago",
-            },
-            {
-                "name": "Laptop Stand",
-                "category": "Accessories",
-                "quantity": 8,
-                "status": "Low",
-                "updated": "3 hours ago",
-            },
-            {
-                "name": "Keyboard Case",
-                "category": "Accessories",
-                "quantity": 156,
-                "status": "Overstock",
-                "updated": "5 hours ago",
-            },
-            {
-                "name": "USB Cable",
-                "category": "Electronics",
-                "quantity": 12,
-                "status": "Low",
-                "updated": "1 hour ago",
-            },
-            {
-                "name": "Monitor Arm",
-                "category": "Furniture",
-                "quantity": 34,
-                "status": "OK",
-                "updated": "2 days ago",
-            },
-            {
-                "name": "Desk Lamp",
-                "category": "Lighting",
-                "quantity": 2,
-                "status": "Dead Stock",
-                "updated": "1 week ago",
-            },
-            {
-                "name": "Notebook Pack",
-                "category": "Stationery",
-                "quantity": 89,
-                "status": "OK",
-                "updated": "4 hours ago",
-            },
-        ]
 
+def _row_signature(item: Product) -> _RowSignature:
+    return _RowSignature(
+        item.name,
+        item.category,
+        item.quantity,
+        item.status,
+        item.updated,
+    )
@@ -1,5 +1,10 @@
 import flet as ft
 
+from services.alert_rules import Alert, AlertRuleEngine
+from services.data_export import ExportJob
+from services.inventory_repository import get_inventory_repository
+from services.session_alerts import SessionAlerts
+
 
 class SettingsPage(ft.Column):
     def __init__(self, page: ft.Page):
@@ -9,6 +14,8 @@ class SettingsPage(ft.Column):
             scroll=ft.ScrollMode.AUTO,
         )
         self.page = page
+        # Section -> shown settings, included in data exports
+        self._settings: dict[str, dict] = {}
 
         self.controls = [
             self._top_bar(),
@@ -127,6 +134,7 @@ class SettingsPage(ft.Column):
     # ------------- Generic section card -------------
 
     def _section_card(self, icon, title: str, rows: list, button_text: str, on_click):
+        self._settings[title] = dict(rows)
         return ft.Container(
             padding=16,
             bgcolor="#020617",
@@ -332,10 +340,119 @@ class SettingsPage(ft.Column):
         self._show_snack("Preferences editing coming soon.")
 
     def _on_export_data(self, e):
-        # TODO: trigger backend export job and send link/email
-        self._show_snack("Data export request submitted (placeholder).")
+        format_group = ft.RadioGroup(
+            value="csv",
+            content=ft.Row(
+                controls=[
+                    ft.Radio(value="csv", label="CSV"),
+                    ft.Radio(value="jsonl", label="JSON Lines"),
+                ],
+            ),
+        )
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Export data"),
+            content=ft.Column(
+                tight=True,
+                spacing=10,
+                controls=[
+                    ft.Text(
+                        "Inventory, alerts, sales and settings are written to "
+                        "gzip-compressed files.",
+                        size=12,
+                        color="#9CA3AF",
+                    ),
+                    format_group,
+                ],
+            ),
+            actions=[
+                ft.TextButton("Cancel", on_click=lambda ev: self._close_dialog()),
+                ft.FilledButton(
+                    "Export",
+                    on_click=lambda ev: self._start_export(format_group.value),
+                ),
+            ],
+        )
+        self.page.dialog = dlg
+        dlg.open = True
+        self.page.update()
+
+    def _start_export(self, fmt: str):
+        repo = get_inventory_repository()
+        job = ExportJob(
+            repo.path,
+            fmt=fmt,
+            settings=self._settings,
+            datasets={"alerts": _alert_rows(self._session_alerts(repo))},
+        )
+        progress_bar = ft.ProgressBar(value=0, width=320)
+        status_text = ft.Text("Starting export...", size=12, color="#9CA3AF")
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Exporting data"),
+            content=ft.Column(
+                tight=True,
+                spacing=10,
+                controls=[progress_bar, status_text],
+            ),
+            actions=[ft.TextButton("Cancel", on_click=lambda ev: job.cancel())],
+        )
+        self.page.dialog = dlg
+        dlg.open = True
+        self.page.update()
+        # The export runs in its own process; this thread only relays progress
+        self.page.run_thread(self._run_export, job, progress_bar, status_text)
+
+    def _run_export(self, job: ExportJob, progress_bar, status_text):
+        def on_progress(update):
+            # One message per chunk of rows
+            progress_bar.value = update["progress"]
+            status_text.value = (
+                f"{update['dataset'].title()}: "
+                f"{update['rows']:,} of {update['total']:,} rows"
+            )
+            self.page.update()
+
+        try:
+            report = job.run(on_progress)
+        except (OSError, RuntimeError) as ex:
+            self._close_dialog()
+            self._show_snack(f"Export failed: {ex}")
+            return
+
+        self._close_dialog()
+        if report["cancelled"]:
+            self._show_snack("Export cancelled.")
+            return
+        rows = sum(report["rows"].values())
+        message = (
+            f"Exported {rows:,} rows to {report['dir']} "
+            f"in {report['seconds']:.1f} s"
+        )
+        if report["skipped"]:
+            message += f" (no local {', '.join(report['skipped'])} data yet)"
+        self._show_snack(message)
+
+    def _session_alerts(self, repo) -> list[Alert]:
+        """
+        The session's alerts, as resolved, dismissed and pushed; while they
+        are still loading, what the rules raise for the catalog now.
+        """
+        alerts = SessionAlerts.for_page(self.page)
+        if alerts.loaded:
+            return list(alerts.store)
+        return AlertRuleEngine().alerts(repo)
+
+    def _close_dialog(self):
+        if self.page.dialog:
+            self.page.dialog.open = False
+            self.page.update()
 
     def _on_clear_cache(self, e):
         # TODO: clear local cache_service and maybe remote sessions
         self._show_snack("Local cache cleared (placeholder).")
 
+
+def _alert_rows(alerts: list[Alert]) -> tuple[list[str], list[tuple]]:
+    columns = list(Alert.__slots__)
+    return columns, [tuple(getattr(a, c) for c in columns) for a in alerts]
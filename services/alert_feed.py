@@ -0,0 +1,51 @@
+import threading
+
+from services.alert_rules import AlertRuleEngine
+from services.event_bus import ALERTS_TOPIC, STOCK_TOPIC, EventBus, get_event_bus
+from services.inventory_repository import (
+    InventoryRepository,
+    StockUpdate,
+    get_inventory_repository,
+)
+
+
+class AlertFeed:
+    """
+    Puts catalog writes on the bus. Every stock update of the repository is
+    republished on STOCK_TOPIC (status counts, inventory tables), then the
+    rules are evaluated for the SKUs it wrote only and every alert raised
+    is published on ALERTS_TOPIC. Rules are evaluated on every quantity
+    write, not just on status changes, because some of them (overstock at
+    1.5x the optimal level) fire between status boundaries.
+    """
+
+    def __init__(
+        self,
+        repo: InventoryRepository,
+        engine: AlertRuleEngine | None = None,
+        bus: EventBus | None = None,
+    ):
+        self.repo = repo
+        self.engine = engine or AlertRuleEngine()
+        self.bus = bus or get_event_bus()
+        repo.subscribe(self._on_stock_update)
+
+    def _on_stock_update(self, update: StockUpdate):
+        self.bus.publish(STOCK_TOPIC, update)
+        if not update.item_ids:
+            return
+        for alert in self.engine.alerts(self.repo, item_ids=update.item_ids):
+            self.bus.publish(ALERTS_TOPIC, alert)
+
+
+_feed: AlertFeed | None = None
+_feed_lock = threading.Lock()
+
+
+def start_alert_feed() -> AlertFeed:
+    """Start the process-wide feed (idempotent)."""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = AlertFeed(get_inventory_repository())
+        return _feed
@@ -0,0 +1,218 @@
+import time
+from typing import Iterable
+
+import numpy as np
+
+
+# Rule kinds
+BELOW_REORDER_POINT = "below_reorder_point"
+ABOVE_OPTIMAL = "above_optimal"
+NO_SALES = "no_sales"
+
+_DAY = 86400
+
+
+class AlertRule:
+    """
+    One declarative alert rule.
+
+    - BELOW_REORDER_POINT: quantity at or below the SKU's reorder point
+    - ABOVE_OPTIMAL: quantity at least `factor` x the optimal level, the
+      midpoint between reorder point and overstock ceiling
+    - NO_SALES: stock on hand and no sale for `days` days (the SKU's own
+      dead stock days when None); never-sold SKUs do not fire
+    """
+
+    __slots__ = ("id", "kind", "type", "severity", "factor", "days")
+
+    def __init__(
+        self,
+        id: str,
+        kind: str,
+        type: str,
+        severity: str,
+        factor: float = 1.0,
+        days: int | None = None,
+    ):
+        if kind not in _PREDICATES:
+            raise ValueError(f"Unknown rule kind: {kind}")
+        self.id = id
+        self.kind = kind
+        self.type = type
+        self.severity = severity
+        self.factor = factor
+        self.days = days
+
+    def __repr__(self) -> str:
+        return f"AlertRule({self.id!r}, {self.kind!r})"
+
+
+class Alert:
+    """
+    One alert as the screens see it. Alerts raised by a rule have the
+    stable id "<rule id>:<product id>", so re-evaluating the catalog yields
+    the same id for the same condition. `count` is how many firings the
+    alert stands for and `time` the latest of them.
+    """
+
+    __slots__ = (
+        "id",
+        "rule",
+        "type",
+        "severity",
+        "product_id",
+        "product",
+        "message",
+        "time",
+        "resolved",
+        "count",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        rule: str,
+        type: str,
+        severity: str,
+        product_id: int | None,
+        product: str,
+        message: str,
+        time: float,
+        resolved: bool = False,
+        count: int = 1,
+    ):
+        self.id = id
+        self.rule = rule
+        self.type = type
+        self.severity = severity
+        self.product_id = product_id
+        self.product = product
+        self.message = message
+        self.time = time
+        self.resolved = resolved
+        self.count = count
+
+    def copy(self) -> "Alert":
+        return Alert(*(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"Alert({self.id!r}, {self.severity!r})"
+
+
+class AlertRuleEngine:
+    """
+    Evaluates alert rules over the whole catalog at once.
+
+    Each rule is one vectorised NumPy expression over the catalog's stock
+    columns (see InventoryRepository.stock_columns), so a full evaluation
+    costs a few array passes per rule; Python objects are only built for
+    the SKUs that fire.
+    """
+
+    def __init__(self, rules: Iterable[AlertRule] | None = None):
+        self.rules = DEFAULT_RULES if rules is None else tuple(rules)
+
+    def evaluate(
+        self, columns: dict[str, np.ndarray], now: float | None = None
+    ) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """{rule id: (product ids that fire, measured value per id)}."""
+        now = time.time() if now is None else now
+        hits = {}
+        for rule in self.rules:
+            mask, measure = _PREDICATES[rule.kind](rule, columns, now)
+            hits[rule.id] = (columns["id"][mask], measure[mask])
+        return hits
+
+    def alerts(
+        self, repo, now: float | None = None, item_ids: list[int] | None = None
+    ) -> list[Alert]:
+        """
+        Alert records for every rule hit in `repo`'s catalog, or only among
+        `item_ids` (e.g. the SKUs a write just changed).
+        """
+        now = time.time() if now is None else now
+        columns = repo.stock_columns()
+        if item_ids is not None:
+            mask = np.isin(columns["id"], np.asarray(item_ids, dtype=np.int64))
+            columns = {name: column[mask] for name, column in columns.items()}
+        hits = self.evaluate(columns, now)
+        fired = [ids for ids, _ in hits.values()]
+        names = repo.names(np.unique(np.concatenate(fired)).tolist() if fired else [])
+        position = np.full(int(columns["id"].max(initial=-1)) + 1, -1, dtype=np.int64)
+        position[columns["id"]] = np.arange(len(columns["id"]))
+
+        alerts = []
+        for rule in self.rules:
+            ids, measure = hits[rule.id]
+            rows = position[ids]
+            ids = ids.tolist()
+            products = [names.get(i) or f"#{i}" for i in ids]
+            messages = _messages(
+                rule,
+                products,
+                columns["quantity"][rows].tolist(),
+                measure.tolist(),
+                columns["reorder_point"][rows].tolist(),
+            )
+            prefix = f"{rule.id}:"
+            alerts += [
+                Alert(prefix + str(i), rule.id, rule.type, rule.severity, i, name, message, now)
+                for i, name, message in zip(ids, products, messages)
+            ]
+        return alerts
+
+
+# ---------------- Rule predicates ----------------
+# (rule, columns, now) -> (mask, measured value) over the catalog
+
+
+def _below_reorder_point(rule, columns, now):
+    qty = columns["quantity"]
+    return qty <= columns["reorder_point"], qty
+
+
+def _above_optimal(rule, columns, now):
+    qty = columns["quantity"]
+    optimal = (columns["reorder_point"] + columns["overstock_ceiling"]) / 2
+    ratio = qty / np.maximum(optimal, 1)
+    return ratio >= rule.factor, ratio
+
+
+def _no_sales(rule, columns, now):
+    # NaN (never sold) compares False
+    idle_days = (now - columns["last_sale"]) / _DAY
+    days = columns["dead_stock_days"] if rule.days is None else rule.days
+    return (columns["quantity"] > 0) & (idle_days >= days), idle_days
+
+
+_PREDICATES = {
+    BELOW_REORDER_POINT: _below_reorder_point,
+    ABOVE_OPTIMAL: _above_optimal,
+    NO_SALES: _no_sales,
+}
+
+
+def _messages(rule, products, quantities, values, reorder_points) -> list[str]:
+    if rule.kind == BELOW_REORDER_POINT:
+        return [
+            f"{name} stock is at or below its reorder point "
+            f"({qty} units remaining, reorder at {reorder_point})."
+            for name, qty, reorder_point in zip(products, quantities, reorder_points)
+        ]
+    if rule.kind == ABOVE_OPTIMAL:
+        return [
+            f"{name} inventory is {ratio:.1f}x its optimal level ({qty} units)."
+            for name, qty, ratio in zip(products, quantities, values)
+        ]
+    return [
+        f"No {name} sold in {int(days)} days ({qty} units on hand)."
+        for name, qty, days in zip(products, quantities, values)
+    ]
+
+
+# Rules the alerts screen evaluates
+DEFAULT_RULES = (
+    AlertRule("low-stock", BELOW_REORDER_POINT, "Low Stock Warning", "critical"),
+    AlertRule("overstock", ABOVE_OPTIMAL, "Overstock Alert", "warning", factor=1.5),
+    AlertRule("dead-stock", NO_SALES, "Dead Stock Alert", "warning"),
+)
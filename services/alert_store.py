@@ -0,0 +1,236 @@
+import os
+import threading
+from collections import Counter, defaultdict
+from typing import Iterable, Iterator
+
+from services.alert_rules import Alert
+from services.search_index import TokenIndex
+
+
+# Re-fires of an open alert within this many seconds of its last firing are
+# folded into it instead of listed again.
+ALERT_SUPPRESSION_WINDOW_S = float(os.environ.get("VYAPAR_ALERT_SUPPRESSION_S", "3600"))
+
+
+class AlertStore:
+    """
+    The alerts of a session, indexed for the alerts screen's filters.
+
+    Queries list the newest alert first. Each one gets a small integer key;
+    severity, type and product map to sets of keys and a word index covers
+    type, message and product, so a query intersects at most three sets
+    (smallest first) instead of scanning every alert. Text is indexed as
+    alerts are added, so no search pays for indexing a bulk load; the
+    alerts screen fills its store off the page loop.
+
+    Unresolved alerts are also counted per severity and per type. The
+    counters move by one on every insert, remove and resolve, so summary
+    figures never need a pass over the alerts.
+
+    Alerts are deduplicated on their (rule, product, severity) fingerprint:
+    a rule that keeps firing for the same product updates one alert's count
+    and time for as long as it re-fires within `suppression_window`, so the
+    list stays one card per open condition.
+    """
+
+    def __init__(self, suppression_window: float = ALERT_SUPPRESSION_WINDOW_S):
+        self.suppression_window = suppression_window
+        self._lock = threading.RLock()
+        self._alerts: dict[int, Alert] = {}
+        self._keys: dict[str, int] = {}
+        self._fingerprints: dict[tuple, int] = {}
+        self._next_key = 0
+        self._by_severity: dict[str, set[int]] = defaultdict(set)
+        self._by_type: dict[str, set[int]] = defaultdict(set)
+        self._by_product: dict[int, set[int]] = defaultdict(set)
+        self._text = TokenIndex()
+        self._active = 0
+        self._severity_counts: Counter[str] = Counter()
+        self._type_counts: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def __iter__(self) -> Iterator[Alert]:
+        with self._lock:
+            return iter(list(self._alerts.values()))
+
+    def get(self, alert_id: str) -> Alert | None:
+        key = self._keys.get(alert_id)
+        return None if key is None else self._alerts.get(key)
+
+    def add(self, alert: Alert) -> Alert:
+        """
+        Record a firing of `alert` and return the stored alert.
+
+        A re-fire of an open alert with the same fingerprint within the
+        suppression window updates that alert in place (count, time and
+        latest message). Anything else is stored as a new alert, listed
+        first, replacing a stale one with the same id or fingerprint. The
+        store keeps its own copy, so sessions sharing a pushed alert do not
+        share its count or resolved flag.
+        """
+        with self._lock:
+            fingerprint = _fingerprint(alert)
+            key = self._fingerprints.get(fingerprint)
+            if key is not None:
+                existing = self._alerts[key]
+                if (
+                    not existing.resolved
+                    and alert.time - existing.time <= self.suppression_window
+                ):
+                    existing.count += alert.count
+                    existing.time = max(existing.time, alert.time)
+                    if existing.message != alert.message:
+                        existing.message = alert.message
+                        self._index_text(key, existing)
+                    return existing
+                self._drop(key)
+            key = self._keys.get(alert.id)
+            if key is not None:
+                self._drop(key)
+
+            alert = alert.copy()
+            key = self._next_key
+            self._next_key += 1
+            self._keys[alert.id] = key
+            self._fingerprints[fingerprint] = key
+            self._alerts[key] = alert
+            self._count(alert, 1)
+            self._by_severity[alert.severity].add(key)
+            self._by_type[alert.type].add(key)
+            if alert.product_id is not None:
+                self._by_product[alert.product_id].add(key)
+            self._index_text(key, alert)
+            return alert
+
+    def add_many(self, alerts: Iterable[Alert]):
+        with self._lock:
+            for alert in alerts:
+                self.add(alert)
+
+    def remove(self, alert_id: str) -> Alert | None:
+        with self._lock:
+            key = self._keys.get(alert_id)
+            return None if key is None else self._drop(key)
+
+    def resolve(self, alert_id: str) -> bool:
+        """Mark an alert resolved; it stays listed until removed."""
+        with self._lock:
+            alert = self.get(alert_id)
+            if alert is None or alert.resolved:
+                return False
+            self._count(alert, -1)
+            alert.resolved = True
+            return True
+
+    def remove_many(self, alert_ids: Iterable[str]) -> list[Alert]:
+        with self._lock:
+            removed = [self.remove(alert_id) for alert_id in alert_ids]
+        return [alert for alert in removed if alert is not None]
+
+    def remove_products(self, product_ids: Iterable[int]) -> list[Alert]:
+        """Remove every alert about `product_ids` (e.g. deleted SKUs)."""
+        with self._lock:
+            keys = [
+                key
+                for product_id in product_ids
+                for key in self._by_product.get(product_id, ())
+            ]
+            return [self._drop(key) for key in keys]
+
+    def clear(self):
+        with self._lock:
+            self._alerts.clear()
+            self._keys.clear()
+            self._fingerprints.clear()
+            self._by_severity.clear()
+            self._by_type.clear()
+            self._by_product.clear()
+            self._text.clear()
+            self._active = 0
+            self._severity_counts.clear()
+            self._type_counts.clear()
+
+    @property
+    def active(self) -> int:
+        """Unresolved alerts."""
+        return self._active
+
+    def severity_count(self, severity: str) -> int:
+        """Unresolved alerts of `severity`."""
+        return self._severity_counts[severity]
+
+    def type_count(self, alert_type: str) -> int:
+        """Unresolved alerts of `alert_type`."""
+        return self._type_counts[alert_type]
+
+    def types(self) -> list[str]:
+        with self._lock:
+            return sorted(self._by_type)
+
+    def query(
+        self,
+        search: str = "",
+        severity: str | None = None,
+        type: str | None = None,
+    ) -> list[Alert]:
+        """Alerts matching every given filter, newest first."""
+        with self._lock:
+            sets = []
+            if severity is not None:
+                sets.append(self._by_severity.get(severity, set()))
+            if type is not None:
+                sets.append(self._by_type.get(type, set()))
+            if search:
+                sets.append(self._text.search(search))
+            if not sets:
+                return list(reversed(self._alerts.values()))
+
+            sets.sort(key=len)
+            keys = set(sets[0])
+            for other in sets[1:]:
+                keys &= other
+                if not keys:
+                    break
+            # Keys grow with insertion, so sorting them restores that order
+            return [self._alerts[key] for key in sorted(keys, reverse=True)]
+
+    def _drop(self, key: int) -> Alert:
+        alert = self._alerts.pop(key)
+        del self._keys[alert.id]
+        fingerprint = _fingerprint(alert)
+        if self._fingerprints.get(fingerprint) == key:
+            del self._fingerprints[fingerprint]
+        self._unindex(key, alert)
+        return alert
+
+    def _count(self, alert: Alert, delta: int):
+        if alert.resolved:
+            return
+        self._active += delta
+        self._severity_counts[alert.severity] += delta
+        self._type_counts[alert.type] += delta
+
+    def _index_text(self, key: int, alert: Alert):
+        # Re-adding a key replaces its words
+        self._text.add(key, (alert.type, alert.message, alert.product))
+
+    def _unindex(self, key: int, alert: Alert):
+        self._count(alert, -1)
+        for index, value in (
+            (self._by_severity, alert.severity),
+            (self._by_type, alert.type),
+            (self._by_product, alert.product_id),
+        ):
+            keys = index.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[value]
+        self._text.remove(key)
+
+
+def _fingerprint(alert: Alert) -> tuple:
+    product = alert.product if alert.product_id is None else alert.product_id
+    return (alert.rule, product, alert.severity)
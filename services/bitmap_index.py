@@ -0,0 +1,113 @@
+import sys
+from collections import defaultdict
+from typing import Iterable
+
+
+# Bit positions set in each byte value, for decoding bitmaps a byte at a time
+_BYTE_BITS = [tuple(b for b in range(8) if value >> b & 1) for value in range(256)]
+
+
+def bitmap_from_ids(ids: Iterable[int]) -> int:
+    """Bitset with bit `n` set for every id `n`."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buf = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def ids_from_bitmap(bitmap: int) -> list[int]:
+    """Ascending ids of the bits set in `bitmap`."""
+    if not bitmap:
+        return []
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    ids = []
+    for offset, value in enumerate(data):
+        if value:
+            base = offset << 3
+            ids.extend(base + b for b in _BYTE_BITS[value])
+    return ids
+
+
+class BitmapIndex:
+    """
+    Value -> bitset of item ids, for low-cardinality fields such as category
+    and status. Filters combine with `&`, and facet counts are popcounts.
+    Values are interned so the per-item map shares one string per value.
+    """
+
+    def __init__(self):
+        self._bitmaps: dict[str, int] = {}
+        self._values: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def build(self, pairs: Iterable[tuple[int, str]]):
+        """Replace the index from (item id, value) pairs in one pass."""
+        groups: dict[str, list[int]] = defaultdict(list)
+        self._values = {}
+        for item_id, value in pairs:
+            value = sys.intern(str(value))
+            groups[value].append(item_id)
+            self._values[item_id] = value
+        self._bitmaps = {value: bitmap_from_ids(ids) for value, ids in groups.items()}
+
+    def add(self, item_id: int, value: str):
+        value = sys.intern(str(value))
+        self.remove(item_id)
+        self._values[item_id] = value
+        self._bitmaps[value] = self._bitmaps.get(value, 0) | (1 << item_id)
+
+    def add_many(self, pairs: Iterable[tuple[int, str]]):
+        """Bulk `add`: one OR per value instead of one per item."""
+        groups: dict[str, list[int]] = defaultdict(list)
+        for item_id, value in pairs:
+            value = sys.intern(str(value))
+            self.remove(item_id)
+            self._values[item_id] = value
+            groups[value].append(item_id)
+        for value, ids in groups.items():
+            self._bitmaps[value] = self._bitmaps.get(value, 0) | bitmap_from_ids(ids)
+
+    def remove(self, item_id: int):
+        value = self._values.pop(item_id, None)
+        if value is None:
+            return
+        bitmap = self._bitmaps[value] & ~(1 << item_id)
+        if bitmap:
+            self._bitmaps[value] = bitmap
+        else:
+            del self._bitmaps[value]
+
+    def remove_many(self, item_ids: Iterable[int]):
+        """Bulk `remove`: one AND-NOT per value instead of one per item."""
+        groups: dict[str, list[int]] = defaultdict(list)
+        for item_id in item_ids:
+            value = self._values.pop(item_id, None)
+            if value is not None:
+                groups[value].append(item_id)
+        for value, ids in groups.items():
+            bitmap = self._bitmaps[value] & ~bitmap_from_ids(ids)
+            if bitmap:
+                self._bitmaps[value] = bitmap
+            else:
+                del self._bitmaps[value]
+
+    def ids(self) -> list[int]:
+        """Every indexed item id."""
+        return list(self._values)
+
+    def bitmap(self, value: str) -> int:
+        return self._bitmaps.get(value, 0)
+
+    def values(self) -> list[str]:
+        return sorted(self._bitmaps)
+
+    def counts(self, mask: int | None = None) -> dict[str, int]:
+        """Items per value, restricted to `mask` when given."""
+        if mask is None:
+            return {v: b.bit_count() for v, b in self._bitmaps.items()}
+        return {v: (b & mask).bit_count() for v, b in self._bitmaps.items()}
@@ -0,0 +1,238 @@
+import csv
+import gzip
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import sqlite3
+import time
+from typing import Callable
+
+
+# Where export folders are written (one timestamped folder per export).
+EXPORT_DIR = os.environ.get("VYAPAR_EXPORT_DIR", "exports")
+
+# Rows read and written per chunk.
+EXPORT_CHUNK_SIZE = 10_000
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+# Dataset -> table in the local database. Datasets whose table does not
+# exist yet (nothing stored locally) are skipped and listed in the report.
+# Alerts live in the app process, not the database; they are handed to the
+# job as a dataset of rows (see ExportJob).
+EXPORT_TABLES = {
+    "inventory": "items",
+    "sales": "sales",
+}
+
+
+class ExportJob:
+    """
+    One data export running in a worker process.
+
+    The worker opens its own connection to the catalog database and streams
+    each table out a chunk at a time into gzip-compressed CSV or JSONL, so
+    neither the UI event loop nor the GIL of the app process is involved and
+    memory stays at one chunk however large the tables are. Progress comes
+    back over a queue; `cancel()` stops the worker between chunks and the
+    partial folder is removed.
+
+    `datasets` are exported alongside the tables for data that only the app
+    process holds: {dataset: (column names, rows)}, written the same way.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        fmt: str = "csv",
+        settings: dict | None = None,
+        datasets: dict[str, tuple[list[str], list[tuple]]] | None = None,
+        out_dir: str = EXPORT_DIR,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        self.db_path = os.path.abspath(db_path)
+        self.fmt = fmt
+        self.settings = settings or {}
+        self.datasets = datasets or {}
+        self.out_dir = out_dir
+        self.chunk_size = chunk_size
+        # spawn, not fork: the app process runs threads and an event loop
+        self._ctx = multiprocessing.get_context("spawn")
+        self._cancel = self._ctx.Event()
+        self._queue = self._ctx.Queue()
+        self._process = None
+
+    def run(self, on_progress: Callable[[dict], None] | None = None) -> dict:
+        """
+        Start the worker and wait for it, passing every progress message to
+        `on_progress`. Blocks, so call it from a worker thread.
+        """
+        target = os.path.join(
+            self.out_dir, time.strftime("vyapar_export_%Y%m%d_%H%M%S")
+        )
+        self._process = self._ctx.Process(
+            target=_export_worker,
+            args=(
+                self.db_path,
+                target,
+                self.fmt,
+                self.settings,
+                self.datasets,
+                self.chunk_size,
+                self._queue,
+                self._cancel,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        try:
+            while True:
+                try:
+                    kind, payload = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    if not self._process.is_alive():
+                        raise RuntimeError("export worker exited unexpectedly")
+                    continue
+                if kind == "progress":
+                    if on_progress:
+                        on_progress(payload)
+                elif kind == "error":
+                    raise RuntimeError(payload)
+                else:
+                    return payload
+        finally:
+            self._process.join(timeout=5)
+
+    def cancel(self):
+        self._cancel.set()
+
+
+# ---------------- Worker process ----------------
+
+
+def _export_worker(db_path, target, fmt, settings, datasets, chunk_size, out, cancel):
+    try:
+        out.put((
+            "done",
+            _export(db_path, target, fmt, settings, datasets, chunk_size, out, cancel),
+        ))
+    except Exception as ex:  # reported to the app instead of dying silently
+        shutil.rmtree(target, ignore_errors=True)
+        out.put(("error", f"{type(ex).__name__}: {ex}"))
+
+
+def _export(db_path, target, fmt, settings, datasets, chunk_size, out, cancel) -> dict:
+    started = time.perf_counter()
+    os.makedirs(target, exist_ok=True)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        existing = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        tables = {d: t for d, t in EXPORT_TABLES.items() if t in existing}
+        totals = {
+            d: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+            for d, t in tables.items()
+        }
+        totals.update((d, len(rows)) for d, (_, rows) in datasets.items())
+        report = {
+            "dir": target,
+            "files": [],
+            "rows": {},
+            "skipped": [d for d in EXPORT_TABLES if d not in tables],
+            "cancelled": False,
+            "seconds": 0.0,
+        }
+        grand_total = sum(totals.values()) or 1
+        done = 0
+
+        sources = []
+        for dataset, table in tables.items():
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            sources.append((dataset, columns, _chunks(conn, table, columns, chunk_size)))
+        for dataset, (columns, rows) in datasets.items():
+            sources.append((dataset, columns, _slices(rows, chunk_size)))
+
+        for dataset, columns, chunks in sources:
+            path = os.path.join(target, f"{dataset}.{fmt}.gz")
+            written = 0
+            with gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=6) as f:
+                write = _writer(f, fmt, columns)
+                for rows in chunks:
+                    if cancel.is_set():
+                        report["cancelled"] = True
+                        break
+                    write(rows)
+                    written += len(rows)
+                    done += len(rows)
+                    out.put((
+                        "progress",
+                        {
+                            "dataset": dataset,
+                            "rows": written,
+                            "total": totals[dataset],
+                            "progress": min(done / grand_total, 1.0),
+                        },
+                    ))
+            if report["cancelled"]:
+                break
+            report["files"].append(path)
+            report["rows"][dataset] = written
+
+        if not report["cancelled"]:
+            path = os.path.join(target, "settings.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(settings, f, indent=2, ensure_ascii=False)
+            report["files"].append(path)
+    finally:
+        conn.close()
+
+    if report["cancelled"]:
+        shutil.rmtree(target, ignore_errors=True)
+        report["files"] = []
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+
+def _chunks(conn: sqlite3.Connection, table: str, columns: list[str], chunk_size: int):
+    """
+    Yield rows a chunk at a time, paging on rowid so no read transaction
+    stays open between chunks and app writes are never blocked for the
+    length of the export.
+    """
+    sql = (
+        f"SELECT rowid, {', '.join(columns)} FROM {table} "
+        "WHERE rowid > ? ORDER BY rowid LIMIT ?"
+    )
+    last = 0
+    while True:
+        rows = conn.execute(sql, (last, chunk_size)).fetchall()
+        if not rows:
+            return
+        last = rows[-1][0]
+        yield [row[1:] for row in rows]
+
+
+def _slices(rows: list, chunk_size: int):
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start : start + chunk_size]
+
+
+def _writer(f, fmt: str, columns: list[str]):
+    if fmt == "csv":
+        csv_writer = csv.writer(f)
+        csv_writer.writerow(columns)
+        return csv_writer.writerows
+
+    def write_jsonl(rows):
+        f.writelines(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+    return write_jsonl
@@ -0,0 +1,69 @@
+import asyncio
+import os
+import threading
+from typing import Any, Callable
+
+import flet as ft
+
+
+# Typing pause before a search runs.
+SEARCH_DEBOUNCE_S = float(os.environ.get("VYAPAR_SEARCH_DEBOUNCE_MS", "250")) / 1000
+
+
+class DebouncedSearch:
+    """
+    Debounced, cancellable search pipeline for a screen's search box.
+
+    `submit(*args)` cancels any in-flight search and schedules a new one. The
+    search waits `delay` seconds (pass `delay=0` for discrete actions such
+    as a dropdown or sort click), then `query(*args)` runs on a worker
+    thread so large lookups stay off the UI event loop. Only the latest
+    result is passed to `render(result)`, followed by one `page.update()`.
+    """
+
+    def __init__(
+        self,
+        page: ft.Page,
+        query: Callable[..., Any],
+        render: Callable[[Any], None],
+        delay: float = SEARCH_DEBOUNCE_S,
+    ):
+        self.page = page
+        self.query = query
+        self.render = render
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = None
+
+    def submit(self, *args, delay: float | None = None):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.cancel()
+            self._generation += 1
+            self._pending = self.page.run_task(
+                self._run,
+                self._generation,
+                args,
+                self.delay if delay is None else delay,
+            )
+
+    def cancel(self):
+        """Drop the pending search, if any; its result is never rendered."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.cancel()
+                self._pending = None
+            self._generation += 1
+
+    async def _run(self, generation: int, args: tuple, delay: float):
+        if delay > 0:
+            await asyncio.sleep(delay)
+        result = await asyncio.to_thread(self.query, *args)
+        with self._lock:
+            if generation != self._generation:
+                # a newer keystroke superseded this search
+                return
+            self._pending = None
+        self.render(result)
+        self.page.update()
@@ -0,0 +1,146 @@
+import asyncio
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable
+
+import flet as ft
+
+from services.session import session_instance
+from services.weak_callbacks import WeakCallbacks
+
+
+# Minimum time between two pushed UI updates of one session.
+FRAME_INTERVAL_S = float(os.environ.get("VYAPAR_FRAME_INTERVAL_MS", "100")) / 1000
+
+# Topics
+ALERTS_TOPIC = "alerts"  # Alert records
+STOCK_TOPIC = "stock"  # InventoryRepository StockUpdates
+
+_SESSION_KEY = "update_batcher"
+
+
+class EventBus:
+    """
+    In-process publish / subscribe.
+
+    `publish` may be called from any thread and only hands the event to
+    each subscriber; subscribers that touch the UI should go through their
+    session's UpdateBatcher, which moves the work onto the page's event
+    loop. Bound methods are held weakly, so closed sessions drop out.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, WeakCallbacks] = defaultdict(WeakCallbacks)
+
+    def subscribe(self, topic: str, callback: Callable[[str, Any], None]) -> None:
+        with self._lock:
+            self._subscribers[topic].add(callback)
+
+    def publish(self, topic: str, event: Any) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(topic)
+            if not subscribers:
+                return
+            callbacks = subscribers.live()
+        for callback in callbacks:
+            callback(topic, event)
+
+
+_bus: EventBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Process-wide bus shared by every session."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = EventBus()
+        return _bus
+
+
+class UpdateBatcher:
+    """
+    Coalesces bus events into at most one `page.update()` per frame.
+
+    One per session. Screens `listen(topic, handler)`; events are buffered
+    as they arrive and, at most once every `interval` seconds, each handler
+    gets the events of its topic as one list on the page's event loop,
+    followed by a single `page.update()` for all of them. A burst of a
+    thousand events therefore costs a handful of updates.
+    """
+
+    def __init__(
+        self,
+        page: ft.Page,
+        bus: EventBus | None = None,
+        interval: float = FRAME_INTERVAL_S,
+    ):
+        self.page = page
+        self.bus = bus or get_event_bus()
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._handlers: dict[str, WeakCallbacks] = defaultdict(WeakCallbacks)
+        self._pending: list[tuple[str, Any]] = []
+        self._last_flush = 0.0
+        self._task = None
+
+    @classmethod
+    def for_page(cls, page: ft.Page) -> "UpdateBatcher":
+        """The session's batcher, created on first use."""
+        return session_instance(page, _SESSION_KEY, cls)
+
+    def listen(self, topic: str, handler: Callable[[list], None]) -> None:
+        """Call `handler(events)` with batches of `topic` events (held weakly)."""
+        with self._lock:
+            first = topic not in self._handlers
+            self._handlers[topic].add(handler)
+        if first:
+            self.bus.subscribe(topic, self._on_event)
+
+    def unlisten(self, topic: str, handler: Callable[[list], None]) -> None:
+        with self._lock:
+            handlers = self._handlers.get(topic)
+            if handlers is not None:
+                handlers.discard(handler)
+
+    def _on_event(self, topic: str, event: Any):
+        with self._lock:
+            self._pending.append((topic, event))
+            if self._task is None:
+                self._task = self.page.run_task(self._flush)
+
+    async def _flush(self):
+        try:
+            await self._flush_batches()
+        finally:
+            # Events that arrived after the last batch was taken (or a
+            # failing handler or update) must not leave the session without
+            # a flush
+            with self._lock:
+                self._task = self.page.run_task(self._flush) if self._pending else None
+
+    async def _flush_batches(self):
+        while True:
+            wait = self._last_flush + self.interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            with self._lock:
+                pending, self._pending = self._pending, []
+                if not pending:
+                    return
+                handlers = {
+                    topic: handlers.live() for topic, handlers in self._handlers.items()
+                }
+            self._last_flush = time.monotonic()
+
+            by_topic: dict[str, list] = defaultdict(list)
+            for topic, event in pending:
+                by_topic[topic].append(event)
+            for topic, events in by_topic.items():
+                for handler in handlers.get(topic, ()):
+                    handler(events)
+            self.page.update()
@@ -0,0 +1,810 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Callable
+
+from services.bitmap_index import BitmapIndex, bitmap_from_ids, ids_from_bitmap
+from services.product import Product, Status, parse_timestamp
+from services.search_index import TrigramIndex
+from services.sort_index import SortIndex
+from services.stock_status import (
+    DEFAULT_DEAD_STOCK_DAYS,
+    DEFAULT_OVERSTOCK_CEILING,
+    DEFAULT_REORDER_POINT,
+    INPUT_COLUMNS,
+    StockStatusEngine,
+)
+from services.weak_callbacks import WeakCallbacks
+
+
+# Local catalog database; shared by every session of this process.
+DEFAULT_DB_PATH = os.environ.get("VYAPAR_DB_PATH", "vyapar_buddy.db")
+
+# Product fields; also the whitelist of names interpolated into SQL
+COLUMNS = ("name", "category", "quantity", "status", "updated")
+SORT_COLUMNS = COLUMNS
+
+# Per-SKU inputs of the stock status engine; `status` is derived from
+# these and `quantity`, never set directly
+STOCK_COLUMNS = ("reorder_point", "overstock_ceiling", "dead_stock_days", "last_sale")
+_STOCK_DEFAULTS = {
+    "reorder_point": DEFAULT_REORDER_POINT,
+    "overstock_ceiling": DEFAULT_OVERSTOCK_CEILING,
+    "dead_stock_days": DEFAULT_DEAD_STOCK_DAYS,
+    "last_sale": None,
+}
+_WRITABLE_COLUMNS = tuple(c for c in COLUMNS if c != "status") + STOCK_COLUMNS
+# Writing any of these is a stock update for subscribers
+_STOCK_INPUTS = ("quantity",) + STOCK_COLUMNS
+
+# Fields matched by free-text search
+SEARCH_FIELDS = ("name", "category", "status")
+
+# Few distinct values; their sort keys are interned
+_LOW_CARDINALITY = ("category", "status")
+
+# Column order of Product.from_row
+_PRODUCT_SELECT = "SELECT id, name, category, quantity, status, updated FROM items"
+
+_INSERT = (
+    "INSERT INTO items (name, category, quantity, status, updated, "
+    "reorder_point, overstock_ceiling, dead_stock_days, last_sale) "
+    "VALUES (:name, :category, :quantity, :status, :updated, "
+    ":reorder_point, :overstock_ceiling, :dead_stock_days, :last_sale)"
+)
+
+# Added in schema v2
+_STOCK_COLUMNS_DDL = (
+    f"reorder_point INTEGER NOT NULL DEFAULT {DEFAULT_REORDER_POINT}",
+    f"overstock_ceiling INTEGER NOT NULL DEFAULT {DEFAULT_OVERSTOCK_CEILING}",
+    f"dead_stock_days INTEGER NOT NULL DEFAULT {DEFAULT_DEAD_STOCK_DAYS}",
+    "last_sale REAL",  # epoch seconds; NULL = never sold
+)
+_STOCK_COLUMNS_SQL = ",\n    ".join(_STOCK_COLUMNS_DDL)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    quantity INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    updated REAL NOT NULL DEFAULT 0,  -- epoch seconds
+    {_STOCK_COLUMNS_SQL}
+);
+CREATE INDEX IF NOT EXISTS idx_items_name ON items (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_items_category ON items (category);
+CREATE INDEX IF NOT EXISTS idx_items_status ON items (status);
+CREATE INDEX IF NOT EXISTS idx_items_quantity ON items (quantity);
+PRAGMA user_version = 2;
+"""
+
+
+class StockUpdate:
+    """
+    One write's effect on stock, as passed to `subscribe()` listeners.
+
+    `item_ids` are the SKUs whose quantity or thresholds were written (for
+    threshold changes, the SKUs whose status moved); `changes` holds
+    {item_id: (old Status, new Status)} for those whose status changed;
+    `removed` lists the SKUs a delete removed; and `origin` is the token
+    the writer passed (None if it passed none).
+    """
+
+    __slots__ = ("item_ids", "changes", "origin", "removed")
+
+    def __init__(
+        self,
+        item_ids: list[int],
+        changes: dict,
+        origin: object = None,
+        removed: list[int] = (),
+    ):
+        self.item_ids = item_ids
+        self.changes = changes
+        self.origin = origin
+        self.removed = removed
+
+    def __repr__(self) -> str:
+        return (
+            f"StockUpdate({len(self.item_ids)} SKUs, {len(self.changes)} status changes, "
+            f"{len(self.removed)} removed)"
+        )
+
+
+class InventoryRepository:
+    """
+    Product catalog backed by a local SQLite database.
+
+    Screens ask for exactly the slice they show (filter, sort, limit, offset)
+    instead of holding the whole catalog as a Python list. Free-text search
+    is answered by an in-memory trigram index, category / status filters by
+    per-value bitmaps and ordering by per-column sort indexes; all of them
+    are kept in step with every write.
+
+    Stock status is derived from quantity and per-SKU thresholds on every
+    write that can change it; `subscribe()` to hear about stock updates.
+    Writes take an optional `origin` token that is passed back with their
+    update, so a writer can tell its own writes from everyone else's.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        # Flet runs event handlers on worker threads, so the connection is
+        # shared across threads and serialised with a lock.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            self._migrate()
+            with self._conn:
+                self._conn.executescript(_SCHEMA)
+        self._listeners = WeakCallbacks()
+        # Bumped by every index change; invalidates the cached filter results
+        self._version = 0
+        self._members_cache: tuple = (None, None)
+        self._search_cache: tuple = (None, None)
+        self._status_engine = StockStatusEngine()
+        self._search_index = TrigramIndex()
+        self._category_index = BitmapIndex()
+        self._status_index = BitmapIndex()
+        self._sort_indexes = {column: SortIndex() for column in SORT_COLUMNS}
+        self._rebuild_indexes()
+        with self._lock, self._conn:
+            # Days since last sale move on while the app is closed
+            self._restatus()
+
+    # ---------------- Queries ----------------
+
+    def query(
+        self,
+        search: str = "",
+        category: str | None = None,
+        status: str | None = None,
+        sort: str = "name",
+        descending: bool = False,
+        after: tuple | None = None,
+        limit: int | None = None,
+    ) -> list[Product]:
+        """Products of one `query_page` page (every match when `limit` is None)."""
+        if limit is None:
+            return self.get_many(self.query_ids(search, category, status, sort, descending))
+        ids, _ = self.query_page(search, category, status, sort, descending, after, limit)
+        return self.get_many(ids)
+
+    def query_ids(
+        self,
+        search: str = "",
+        category: str | None = None,
+        status: str | None = None,
+        sort: str = "name",
+        descending: bool = False,
+    ) -> list[int]:
+        """Ordered ids of every match; rows are then fetched per page."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort column: {sort}")
+
+        with self._lock:
+            members = self._members(search, category, status)
+            return self._sort_indexes[sort].ids(descending, members)
+
+    def query_page(
+        self,
+        search: str = "",
+        category: str | None = None,
+        status: str | None = None,
+        sort: str = "name",
+        descending: bool = False,
+        after: tuple | None = None,
+        limit: int = 50,
+    ) -> tuple[list[int], tuple | None]:
+        """
+        Keyset pagination: one page of ordered ids and the cursor for the
+        next page (None after the last). Pass the returned cursor back as
+        `after`; it is the last row's (sort key, id), so the page starts with
+        a seek in the sort index instead of skipping OFFSET rows.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort column: {sort}")
+
+        with self._lock:
+            members = self._members(search, category, status)
+            return self._sort_indexes[sort].page(after, limit, descending, members)
+
+    def match_ids(
+        self,
+        search: str = "",
+        category: str | None = None,
+        status: str | None = None,
+    ) -> set[int]:
+        """Unordered ids of every match (e.g. for "select all")."""
+        with self._lock:
+            members = self._members(search, category, status)
+            return set(self._status_index.ids()) if members is None else set(members)
+
+    def get_many(self, item_ids: list[int]) -> list[Product]:
+        """Products for `item_ids`, in the same order."""
+        if not item_ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"{_PRODUCT_SELECT} WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(item_ids),),
+            ).fetchall()
+        by_id = {row[0]: Product.from_row(row) for row in rows}
+        return [by_id[i] for i in item_ids if i in by_id]
+
+    def count(
+        self,
+        search: str = "",
+        category: str | None = None,
+        status: str | None = None,
+    ) -> int:
+        with self._lock:
+            mask = self._match_mask(search, category, status)
+            if mask is None:
+                return len(self._status_index)
+            return mask.bit_count()
+
+    def facet_counts(
+        self,
+        search: str = "",
+        category: str | None = None,
+        status: str | None = None,
+    ) -> dict[str, dict[str, int]]:
+        """
+        Matches per category and per status. Each facet applies the other
+        filters but not its own, so the counts say what selecting a value
+        would return.
+        """
+        with self._lock:
+            return {
+                "category": self._category_index.counts(
+                    self._match_mask(search, None, status)
+                ),
+                "status": self._status_index.counts(
+                    self._match_mask(search, category, None)
+                ),
+            }
+
+    def stock_columns(self) -> dict:
+        """Stock inputs of every SKU as aligned NumPy arrays (see StockStatusEngine.columns)."""
+        with self._lock:
+            return self._status_engine.columns()
+
+    def names(self, item_ids: list[int]) -> dict[int, str]:
+        """{item_id: product name} for `item_ids`."""
+        if not item_ids:
+            return {}
+        with self._lock:
+            return dict(
+                self._conn.execute(
+                    "SELECT id, name FROM items WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(list(item_ids)),),
+                )
+            )
+
+    def categories(self) -> list[str]:
+        return self._category_index.values()
+
+    def get(self, item_id: int) -> Product | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"{_PRODUCT_SELECT} WHERE id = ?", (item_id,)
+            ).fetchone()
+        return Product.from_row(row) if row else None
+
+    def _members(self, search, category, status) -> set[int] | None:
+        """
+        Matching ids as a set (None = all). The last filter's set is kept
+        until the next write, so paging through one result decodes its
+        bitmap once.
+        """
+        key = (search, category, status, self._version)
+        if self._members_cache[0] != key:
+            mask = self._match_mask(search, category, status)
+            members = None if mask is None else set(ids_from_bitmap(mask))
+            self._members_cache = (key, members)
+        return self._members_cache[1]
+
+    def _match_mask(self, search, category, status) -> int | None:
+        """Bitmap of matching ids (AND of all active filters); None = all."""
+        mask = None
+        if category:
+            mask = self._category_index.bitmap(category)
+        if status:
+            bitmap = self._status_index.bitmap(status)
+            mask = bitmap if mask is None else mask & bitmap
+        if search and mask != 0:
+            bitmap = self._search_mask(search)
+            mask = bitmap if mask is None else mask & bitmap
+        return mask
+
+    def _search_mask(self, search) -> int:
+        """
+        Bitmap of the ids matching `search`. Kept until the next write, so
+        the page, count and both facets of one keystroke share one text
+        search.
+        """
+        key = (search, self._version)
+        if self._search_cache[0] != key:
+            self._search_cache = (key, bitmap_from_ids(self._search_index.search(search)))
+        return self._search_cache[1]
+
+    # ---------------- Writes ----------------
+
+    def add(self, item: dict, origin: object = None) -> int:
+        with self._lock, self._conn:
+            item_id = self._conn.execute(_INSERT, _with_defaults(item)).lastrowid
+            changes = self._after_write([item_id])
+        self._emit([item_id], changes, origin)
+        return item_id
+
+    def update(self, item_id: int, origin: object = None, **fields) -> None:
+        columns = [c for c in fields if c in _WRITABLE_COLUMNS]
+        if not columns:
+            return
+        assignments = ", ".join(f"{c} = ?" for c in columns)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE items SET {assignments} WHERE id = ?",
+                [fields[c] for c in columns] + [item_id],
+            )
+            changes = self._after_write([item_id])
+        self._emit(_stock_written([item_id], columns), changes, origin)
+
+    def record_sale(
+        self,
+        item_id: int,
+        quantity: int,
+        when: float | None = None,
+        origin: object = None,
+    ) -> None:
+        """
+        A stock movement out: lower the quantity and stamp the last sale.
+        Only this SKU's status is recomputed.
+        """
+        when = time.time() if when is None else when
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE items SET quantity = MAX(quantity - ?, 0), last_sale = ?, "
+                "updated = ? WHERE id = ?",
+                (quantity, when, when, item_id),
+            )
+            changes = self._after_write([item_id])
+        self._emit([item_id], changes, origin)
+
+    def delete(self, item_id: int, origin: object = None) -> bool:
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+            self._version += 1
+            self._search_index.remove(item_id)
+            self._category_index.remove(item_id)
+            self._status_index.remove(item_id)
+            for index in self._sort_indexes.values():
+                index.remove(item_id)
+            self._status_engine.remove_many([item_id])
+        if cur.rowcount > 0:
+            self._emit([], {}, origin, removed=[item_id])
+        return cur.rowcount > 0
+
+    def delete_many(self, item_ids: list[int], origin: object = None) -> int:
+        """Delete `item_ids` in one transaction; returns how many existed."""
+        if not item_ids:
+            return 0
+        with self._lock, self._conn:
+            ids_json = json.dumps(list(item_ids))
+            removed = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM items WHERE id IN (SELECT value FROM json_each(?))",
+                    (ids_json,),
+                )
+            ]
+            self._conn.execute(
+                "DELETE FROM items WHERE id IN (SELECT value FROM json_each(?))",
+                (ids_json,),
+            )
+            self._version += 1
+            for item_id in item_ids:
+                self._search_index.remove(item_id)
+            self._category_index.remove_many(item_ids)
+            self._status_index.remove_many(item_ids)
+            for index in self._sort_indexes.values():
+                index.remove_many(item_ids)
+            self._status_engine.remove_many(item_ids)
+        self._emit([], {}, origin, removed=removed)
+        return len(removed)
+
+    def update_many(self, item_ids: list[int], origin: object = None, **fields) -> int:
+        """Set the same `fields` on every item in `item_ids` in one transaction."""
+        columns = [c for c in fields if c in _WRITABLE_COLUMNS]
+        if not item_ids or not columns:
+            return 0
+        assignments = ", ".join(f"{c} = ?" for c in columns)
+        return self._bulk_update(
+            f"UPDATE items SET {assignments} "
+            "WHERE id IN (SELECT value FROM json_each(?))",
+            [fields[c] for c in columns],
+            item_ids,
+            _stock_written(item_ids, columns),
+            origin,
+        )
+
+    def adjust_quantity(self, item_ids: list[int], delta: int, origin: object = None) -> int:
+        """Add `delta` to the quantity of `item_ids` (floored at 0) in one transaction."""
+        if not item_ids:
+            return 0
+        return self._bulk_update(
+            "UPDATE items SET quantity = MAX(quantity + ?, 0), updated = ? "
+            "WHERE id IN (SELECT value FROM json_each(?))",
+            [delta, time.time()],
+            item_ids,
+            item_ids,
+            origin,
+        )
+
+    def set_quantities(self, quantities: dict[int, int], origin: object = None) -> int:
+        """
+        Set each item's quantity from {item_id: quantity} in one transaction
+        (a batch of inline edits); statuses of those SKUs are re-derived.
+        """
+        if not quantities:
+            return 0
+        now = time.time()
+        with self._lock, self._conn:
+            cur = self._conn.executemany(
+                "UPDATE items SET quantity = ?, updated = ? WHERE id = ?",
+                [(quantity, now, item_id) for item_id, quantity in quantities.items()],
+            )
+            changes = self._after_write(list(quantities))
+        self._emit(list(quantities), changes, origin)
+        return cur.rowcount
+
+    def set_thresholds(
+        self, item_ids: list[int] | None = None, origin: object = None, **thresholds
+    ) -> int:
+        """
+        Change reorder point / overstock ceiling / dead stock days for
+        `item_ids` (every SKU when None), then re-derive their statuses in
+        one vectorised pass. Returns how many statuses changed; only those
+        SKUs are reported to subscribers, so a catalog-wide change does not
+        re-evaluate every SKU downstream.
+        """
+        thresholds = {
+            c: v for c, v in thresholds.items() if c in STOCK_COLUMNS and c != "last_sale"
+        }
+        if not thresholds:
+            return 0
+        assignments = ", ".join(f"{c} = ?" for c in thresholds)
+        params = list(thresholds.values())
+        with self._lock, self._conn:
+            if item_ids is None:
+                self._conn.execute(f"UPDATE items SET {assignments}", params)
+            else:
+                self._conn.execute(
+                    f"UPDATE items SET {assignments} "
+                    "WHERE id IN (SELECT value FROM json_each(?))",
+                    [*params, json.dumps(list(item_ids))],
+                )
+            self._status_engine.set_thresholds(item_ids, **thresholds)
+            changes = self._restatus(item_ids)
+        self._emit(list(changes), changes, origin)
+        return len(changes)
+
+    def recompute_statuses(self, origin: object = None) -> int:
+        """Re-derive every SKU's status (e.g. daily, as stock ages into Dead Stock)."""
+        with self._lock, self._conn:
+            changes = self._restatus()
+        self._emit(list(changes), changes, origin)
+        return len(changes)
+
+    def _bulk_update(
+        self, sql: str, params: list, item_ids: list[int], stock_ids: list[int], origin
+    ) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute(sql, [*params, json.dumps(list(item_ids))])
+            changes = self._after_write(item_ids)
+        self._emit(stock_ids, changes, origin)
+        return cur.rowcount
+
+    def upsert_many(self, items: list[dict], origin: object = None) -> tuple[int, int]:
+        """
+        Insert or update `items` (matched on product name, case-insensitive)
+        in a single transaction, then index the whole batch at once.
+        Returns (inserted, updated).
+        """
+        if not items:
+            return 0, 0
+        with self._lock, self._conn:
+            existing = {
+                row[0].lower(): row[1]
+                for row in self._conn.execute(
+                    "SELECT name, id FROM items WHERE name COLLATE NOCASE IN "
+                    "(SELECT value FROM json_each(?))",
+                    (json.dumps([item["name"] for item in items]),),
+                )
+            }
+            written = []
+            inserted = 0
+            for item in items:
+                item_id = existing.get(item["name"].lower())
+                if item_id is None:
+                    item_id = self._conn.execute(_INSERT, _with_defaults(item)).lastrowid
+                    existing[item["name"].lower()] = item_id
+                    inserted += 1
+                else:
+                    # Thresholds missing from the input keep their stored value
+                    self._conn.execute(
+                        "UPDATE items SET name = :name, category = :category, "
+                        "quantity = :quantity, updated = :updated, "
+                        "reorder_point = COALESCE(:reorder_point, reorder_point), "
+                        "overstock_ceiling = COALESCE(:overstock_ceiling, overstock_ceiling), "
+                        "dead_stock_days = COALESCE(:dead_stock_days, dead_stock_days), "
+                        "last_sale = COALESCE(:last_sale, last_sale) "
+                        "WHERE id = :id",
+                        {**dict.fromkeys(STOCK_COLUMNS), **item, "id": item_id},
+                    )
+                written.append(item_id)
+            changes = self._after_write(written)
+        self._emit(written, changes, origin)
+        return inserted, len(items) - inserted
+
+    def seed(self, items: list[dict]) -> None:
+        """Insert `items` if the catalog is empty (first run / demo data)."""
+        with self._lock, self._conn:
+            if self._conn.execute("SELECT 1 FROM items LIMIT 1").fetchone():
+                return
+            self._conn.executemany(_INSERT, [_with_defaults(item) for item in items])
+            self._rebuild_indexes()
+            self._restatus()
+
+    # ---------------- Status engine ----------------
+
+    def subscribe(self, callback: Callable[[StockUpdate], None]) -> None:
+        """
+        Call `callback(update)` with a StockUpdate after every write of
+        quantities or thresholds and every delete, on the writing thread. Bound methods are
+        held weakly, so a closed session's page does not stay alive through
+        the shared repository.
+        """
+        with self._lock:
+            self._listeners.add(callback)
+
+    def unsubscribe(self, callback: Callable[[StockUpdate], None]) -> None:
+        with self._lock:
+            self._listeners.discard(callback)
+
+    def _emit(self, item_ids: list[int], changes: dict, origin, removed: list[int] = ()) -> None:
+        # SKUs seen for the first time (old status None) are inserts, not
+        # status changes
+        changes = {i: c for i, c in changes.items() if c[0] is not None}
+        if not item_ids and not changes and not removed:
+            return
+        update = StockUpdate(item_ids, changes, origin, removed)
+        with self._lock:
+            callbacks = self._listeners.live()
+        for callback in callbacks:
+            callback(update)
+
+    def _after_write(self, item_ids: list[int]) -> dict:
+        """
+        Bring the status engine and every index up to date after `item_ids`
+        were written, storing any status that changed. Call inside the
+        write transaction; returns {item_id: (old Status, new Status)}.
+        """
+        rows = {i: dict(row) for i, row in self._fetch_rows(item_ids).items()}
+        self._status_engine.set_many(
+            (i, *(row[c] for c in INPUT_COLUMNS)) for i, row in rows.items()
+        )
+        changes = self._status_engine.recompute(list(rows))
+        self._store_statuses(
+            {i: c for i, c in changes.items() if rows[i]["status"] != c[1].value}
+        )
+        for item_id, (_, new) in changes.items():
+            rows[item_id]["status"] = new.value
+        self._index_many(rows)
+        return changes
+
+    def _restatus(self, item_ids: list[int] | None = None) -> dict:
+        """
+        Re-derive `item_ids` (all SKUs when None) from the engine's columns,
+        without re-reading them, and store and re-index the changed ones.
+        """
+        changes = self._status_engine.recompute(item_ids)
+        self._store_statuses(changes)
+        self._index_many(self._fetch_rows(list(changes)))
+        return changes
+
+    def _store_statuses(self, changes: dict) -> None:
+        if changes:
+            self._conn.executemany(
+                "UPDATE items SET status = ? WHERE id = ?",
+                [(new.value, item_id) for item_id, (_, new) in changes.items()],
+            )
+
+    def _fetch_rows(self, item_ids: list[int]) -> dict:
+        if not item_ids:
+            return {}
+        rows = self._conn.execute(
+            "SELECT * FROM items WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(item_ids)),),
+        ).fetchall()
+        return {row["id"]: row for row in rows}
+
+    # ---------------- In-memory indexes ----------------
+
+    def _index_many(self, items: dict[int, dict]) -> None:
+        self._version += 1
+        for item_id, item in items.items():
+            self._search_index.update(item_id, [item[f] for f in SEARCH_FIELDS])
+        self._category_index.add_many((i, item["category"]) for i, item in items.items())
+        self._status_index.add_many((i, item["status"]) for i, item in items.items())
+        for column, index in self._sort_indexes.items():
+            index.add_many(
+                (i, _sort_key(column, item[column])) for i, item in items.items()
+            )
+
+    def _rebuild_indexes(self) -> None:
+        with self._lock:
+            self._version += 1
+            rows = self._conn.execute("SELECT * FROM items").fetchall()
+            self._search_index.clear()
+            for row in rows:
+                self._search_index.add(row["id"], [row[f] for f in SEARCH_FIELDS])
+            self._category_index.build((row["id"], row["category"]) for row in rows)
+            self._status_index.build((row["id"], row["status"]) for row in rows)
+            for column, index in self._sort_indexes.items():
+                index.build((row["id"], _sort_key(column, row[column])) for row in rows)
+            self._status_engine = StockStatusEngine()
+            self._status_engine.set_many(
+                (row["id"], *(row[c] for c in INPUT_COLUMNS)) for row in rows
+            )
+            self._status_engine.load_statuses(
+                (row["id"], row["status"]) for row in rows
+            )
+
+    # ---------------- Schema migrations ----------------
+
+    def _migrate(self) -> None:
+        """Upgrade a database file written by an older version in place."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items'"
+        ).fetchone()
+        if not exists:
+            return
+
+        if version < 1:
+            # v1: `updated` holds epoch seconds instead of text like
+            # "2 hours ago". The table is rebuilt with the current schema,
+            # so later steps are included.
+            now = time.time()
+
+            def to_epoch(value):
+                try:
+                    return parse_timestamp(value, now)
+                except ValueError:
+                    return now
+
+            self._conn.create_function("to_epoch", 1, to_epoch)
+            self._conn.executescript(
+                "BEGIN;"
+                "ALTER TABLE items RENAME TO items_v0;"
+                + _SCHEMA
+                + "INSERT INTO items (id, name, category, quantity, status, updated) "
+                "SELECT id, name, category, quantity, status, to_epoch(updated) "
+                "FROM items_v0;"
+                "DROP TABLE items_v0;"
+                "COMMIT;"
+            )
+            return
+
+        if version < 2:
+            # v2: per-SKU thresholds that stock status is derived from
+            self._conn.executescript(
+                "BEGIN;"
+                + "".join(f"ALTER TABLE items ADD COLUMN {c};" for c in _STOCK_COLUMNS_DDL)
+                + "PRAGMA user_version = 2;"
+                "COMMIT;"
+            )
+
+
+def _stock_written(item_ids: list[int], columns: list[str]) -> list[int]:
+    # Writes that leave every stock input alone (a rename, a new category)
+    # are not stock updates
+    return list(item_ids) if any(c in _STOCK_INPUTS for c in columns) else []
+
+
+def _with_defaults(item: dict) -> dict:
+    # Insert parameters; status is a placeholder until it is derived
+    row = {"status": Status.OK.value, **item}
+    for column, default in _STOCK_DEFAULTS.items():
+        if row.get(column) is None:
+            row[column] = default
+    return row
+
+
+def _sort_key(column: str, value):
+    # Text sorts case-insensitively, like the table did with COLLATE NOCASE
+    if not isinstance(value, str):
+        return value
+    if column in _LOW_CARDINALITY:
+        return sys.intern(value.lower())
+    return value.lower()
+
+
+# ---------------- Shared instance ----------------
+
+_repository: InventoryRepository | None = None
+_repository_lock = threading.Lock()
+
+
+def get_inventory_repository() -> InventoryRepository:
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = InventoryRepository()
+            # In real app, the catalog will be synced from Firestore / API
+            _repository.seed(SEED_ITEMS)
+        return _repository
+
+
+# ---------------- Demo data (replace with backend sync) ----------------
+
+_HOUR = 3600
+
+SEED_ITEMS = [
+    {
+        "name": "Wireless Mouse",
+        "category": "Electronics",
+        "quantity": 5,
+        "updated": time.time() - 2 * _HOUR,
+    },
+    {
+        "name": "Ergonomic Chair",
+        "category": "Furniture",
+        "quantity": 45,
+        "updated": time.time() - 24 * _HOUR,
+    },
+    {
+        "name": "Laptop Stand",
+        "category": "Accessories",
+        "quantity": 8,
+        "updated": time.time() - 3 * _HOUR,
+    },
+    {
+        "name": "Keyboard Case",
+        "category": "Accessories",
+        "quantity": 156,
+        "updated": time.time() - 5 * _HOUR,
+    },
+    {
+        "name": "USB Cable",
+        "category": "Electronics",
+        "quantity": 12,
+        "updated": time.time() - _HOUR,
+    },
+    {
+        "name": "Monitor Arm",
+        "category": "Furniture",
+        "quantity": 34,
+        "updated": time.time() - 48 * _HOUR,
+    },
+    {
+        "name": "Desk Lamp",
+        "category": "Lighting",
+        "quantity": 2,
+        "updated": time.time() - 7 * 24 * _HOUR,
+        "last_sale": time.time() - 120 * 24 * _HOUR,
+    },
+    {
+        "name": "Notebook Pack",
+        "category": "Stationery",
+        "quantity": 89,
+        "updated": time.time() - 4 * _HOUR,
+    },
+]
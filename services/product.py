@@ -0,0 +1,118 @@
+import re
+import sys
+import time
+from datetime import datetime
+from enum import Enum
+
+
+class Status(str, Enum):
+    """Stock status. Members are singletons, so every product shares them."""
+
+    LOW = "Low"
+    OK = "OK"
+    OVERSTOCK = "Overstock"
+    DEAD_STOCK = "Dead Stock"
+
+    def __str__(self) -> str:
+        return self.value
+
+    @classmethod
+    def parse(cls, text: str) -> "Status":
+        """Case-insensitive lookup by label; raises ValueError."""
+        for status in cls:
+            if status.value.lower() == text.strip().lower():
+                return status
+        raise ValueError(f"unknown status: {text!r}")
+
+
+class Product:
+    """
+    One catalog row as the screens see it.
+
+    Slotted instead of a dict: no per-instance __dict__ and no key strings
+    per row. `category` is interned and `status` is a shared Status member,
+    so repeated values cost one pointer; `updated` is an epoch timestamp.
+    """
+
+    __slots__ = ("id", "name", "category", "quantity", "status", "updated")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        category: str,
+        quantity: int,
+        status: Status,
+        updated: float,
+    ):
+        self.id = id
+        self.name = name
+        self.category = category
+        self.quantity = quantity
+        self.status = status
+        self.updated = updated
+
+    @classmethod
+    def from_row(cls, row) -> "Product":
+        """Build from an (id, name, category, quantity, status, updated) row."""
+        return cls(row[0], row[1], sys.intern(row[2]), row[3], Status(row[4]), row[5])
+
+    def __repr__(self) -> str:
+        return f"Product({self.id!r}, {self.name!r}, {self.status.value!r})"
+
+
+# ---------------- Timestamps ----------------
+
+_UNIT_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400,
+}
+
+_RELATIVE = re.compile(r"^(\d+|an?|one)\s+(second|minute|hour|day|week|month|year)s?\s+ago$")
+
+
+def parse_timestamp(value, now: float | None = None) -> float:
+    """
+    Epoch seconds from an epoch number, an ISO date / datetime or a relative
+    phrase such as "2 hours ago" (how older data stored it). Empty values
+    mean `now`; anything else raises ValueError.
+    """
+    now = time.time() if now is None else now
+    if value is None:
+        return now
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().lower()
+    if not text or text == "just now":
+        return now
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    match = _RELATIVE.match(text)
+    if match:
+        amount = 1 if match[1] in ("a", "an", "one") else int(match[1])
+        return now - amount * _UNIT_SECONDS[match[2]]
+    try:
+        return datetime.fromisoformat(str(value).strip()).timestamp()
+    except ValueError:
+        raise ValueError(f"not a timestamp: {value!r}")
+
+
+def format_relative(timestamp: float, now: float | None = None) -> str:
+    """Display text such as "5 minutes ago" or "just now"."""
+    seconds = max(0, (time.time() if now is None else now) - timestamp)
+    if seconds < 60:
+        return "just now"
+    for unit in ("year", "month", "week", "day", "hour", "minute"):
+        amount = int(seconds // _UNIT_SECONDS[unit])
+        if amount:
+            return f"{amount} {unit}{'s' if amount > 1 else ''} ago"
+    return "just now"
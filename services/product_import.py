@@ -0,0 +1,212 @@
+import csv
+import os
+import threading
+import time
+from typing import Callable, Iterator
+
+from services.inventory_repository import InventoryRepository
+from services.product import parse_timestamp
+
+
+# Rows written per transaction.
+IMPORT_BATCH_SIZE = 5000
+
+# Rejected rows reported back with their reason (the rest are only counted).
+MAX_REPORTED_ERRORS = 20
+
+# Accepted spellings of each column header (compared lower-cased). A
+# status column is ignored: status is derived from stock and thresholds.
+_HEADER_ALIASES = {
+    "name": ("name", "product", "product name"),
+    "category": ("category",),
+    "quantity": ("quantity", "qty", "stock"),
+    "updated": ("updated", "last updated"),
+    "reorder_point": ("reorder point", "reorder_point", "reorder level", "min stock"),
+    "overstock_ceiling": ("overstock ceiling", "overstock_ceiling", "max stock"),
+    "dead_stock_days": ("dead stock days", "dead_stock_days"),
+    "last_sale": ("last sale", "last_sale", "last sold"),
+}
+
+
+def import_products(
+    repo: InventoryRepository,
+    path: str,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    on_progress: Callable[[dict], None] | None = None,
+    cancel: threading.Event | None = None,
+    origin: object = None,
+) -> dict:
+    """
+    Stream a CSV or XLSX file of products into `repo`.
+
+    Rows are read one at a time, validated and upserted in transactions of
+    `batch_size`, so memory stays bounded by one batch whatever the file
+    size. `on_progress` gets the running report after every batch.
+    `origin` tags the writes (see InventoryRepository).
+    """
+    report = {
+        "read": 0,
+        "imported": 0,
+        "inserted": 0,
+        "updated": 0,
+        "rejected": 0,
+        "errors": [],
+        "progress": 0.0,
+        "seconds": 0.0,
+        "rows_per_second": 0.0,
+        "cancelled": False,
+    }
+    started = time.perf_counter()
+
+    def flush(batch: list[dict]):
+        inserted, updated = repo.upsert_many(batch, origin=origin)
+        report["inserted"] += inserted
+        report["updated"] += updated
+        report["imported"] += len(batch)
+        batch.clear()
+        elapsed = time.perf_counter() - started
+        report["seconds"] = elapsed
+        report["rows_per_second"] = report["read"] / elapsed if elapsed else 0.0
+        if on_progress:
+            on_progress(report)
+
+    batch: list[dict] = []
+    for line_no, raw, progress in _read_rows(path):
+        if cancel is not None and cancel.is_set():
+            report["cancelled"] = True
+            break
+        report["read"] += 1
+        report["progress"] = progress
+        try:
+            batch.append(validate_row(raw))
+        except ValueError as ex:
+            report["rejected"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append(f"Row {line_no}: {ex}")
+            continue
+        if len(batch) >= batch_size:
+            flush(batch)
+
+    if not report["cancelled"]:
+        report["progress"] = 1.0
+    flush(batch)
+    return report
+
+
+def validate_row(raw: dict) -> dict:
+    """Normalise one input row into a product dict, or raise ValueError."""
+    name = str(raw.get("name") or "").strip()
+    if not name:
+        raise ValueError("missing product name")
+
+    category = str(raw.get("category") or "").strip()
+    if not category:
+        raise ValueError("missing category")
+
+    product = {
+        "name": name,
+        "category": category,
+        "quantity": _count(raw.get("quantity"), "quantity"),
+        "updated": parse_timestamp(raw.get("updated")),
+    }
+    # Optional; missing thresholds keep the stored value / default
+    for field in ("reorder_point", "overstock_ceiling", "dead_stock_days"):
+        if _present(raw.get(field)):
+            product[field] = _count(raw[field], field.replace("_", " "))
+    if _present(raw.get("last_sale")):
+        product["last_sale"] = parse_timestamp(raw["last_sale"])
+    return product
+
+
+def _count(value, label: str) -> int:
+    try:
+        n = int(float(str(value).strip()))
+    except (TypeError, ValueError):
+        raise ValueError(f"{label} is not a number: {value!r}")
+    if n < 0:
+        raise ValueError(f"{label} is negative")
+    return n
+
+
+def _present(value) -> bool:
+    return value is not None and str(value).strip() != ""
+
+
+# ---------------- Streaming readers ----------------
+
+
+def _read_rows(path: str) -> Iterator[tuple[int, dict, float]]:
+    """Yield (line number, row keyed by field, fraction of file read)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return _read_csv(path)
+    if ext == ".xlsx":
+        return _read_xlsx(path)
+    raise ValueError(f"Unsupported file type: {ext or path}")
+
+
+def _map_header(header: list) -> dict[int, str]:
+    columns = {}
+    for index, title in enumerate(header):
+        title = str(title or "").strip().lower()
+        for field, aliases in _HEADER_ALIASES.items():
+            if title in aliases and field not in columns.values():
+                columns[index] = field
+    missing = {"name", "category", "quantity"} - set(columns.values())
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(sorted(missing))}")
+    return columns
+
+
+def _read_csv(path: str) -> Iterator[tuple[int, dict, float]]:
+    size = os.path.getsize(path) or 1
+    position = 0
+
+    with open(path, "rb") as f:
+
+        def lines():
+            # Decode line by line so the byte offset is known for progress
+            nonlocal position
+            for line in f:
+                position += len(line)
+                yield line.decode("utf-8-sig")
+
+        reader = csv.reader(lines())
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = _map_header(header)
+        for values in reader:
+            if not any(v.strip() for v in values):
+                continue
+            row = {
+                field: values[i] for i, field in columns.items() if i < len(values)
+            }
+            yield reader.line_num, row, position / size
+
+
+def _read_xlsx(path: str) -> Iterator[tuple[int, dict, float]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Excel import needs the openpyxl package (pip install openpyxl)")
+
+    # read_only streams rows from the sheet XML instead of loading the workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        total = ws.max_row or 1
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _map_header(list(header))
+        for line_no, values in enumerate(rows, start=2):
+            if not any(v is not None and str(v).strip() for v in values):
+                continue
+            row = {
+                field: values[i] for i, field in columns.items() if i < len(values)
+            }
+            yield line_no, row, min(line_no / total, 1.0)
+    finally:
+        wb.close()
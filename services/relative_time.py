@@ -0,0 +1,90 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, Iterable
+
+import flet as ft
+
+from services.product import format_relative
+from services.session import session_instance
+from services.weak_callbacks import WeakCallbacks
+
+
+# Seconds between label refreshes; labels have minute resolution.
+RELATIVE_TIME_TICK_S = float(os.environ.get("VYAPAR_RELATIVE_TIME_TICK_S", "30"))
+
+_SESSION_KEY = "relative_time_ticker"
+
+# (label control, epoch timestamp) pairs for the rows a screen has on screen
+LabelSource = Callable[[], Iterable[tuple[ft.Text, float]]]
+
+
+class RelativeTimeTicker:
+    """
+    One timer per session for every "5 minutes ago" label.
+
+    Screens register a source that yields the (Text, timestamp) pairs of
+    the rows they currently render, so a tick costs one `format_relative`
+    per visible row whatever the catalog size. Labels whose text changed are
+    sent together in a single `page.update()`; a tick that changes nothing
+    sends nothing.
+    """
+
+    def __init__(self, page: ft.Page, interval: float = RELATIVE_TIME_TICK_S):
+        self.page = page
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._sources = WeakCallbacks()
+        self._task = None
+
+    @classmethod
+    def for_page(cls, page: ft.Page) -> "RelativeTimeTicker":
+        """The session's ticker, created on first use."""
+        return session_instance(page, _SESSION_KEY, cls)
+
+    def register(self, source: LabelSource) -> None:
+        """
+        Add a label source. Bound methods are held weakly, so a screen the
+        session has dropped stops being ticked.
+        """
+        with self._lock:
+            self._sources.add(source)
+            if self._task is None:
+                self._task = self.page.run_task(self._run)
+
+    def unregister(self, source: LabelSource) -> None:
+        with self._lock:
+            self._sources.discard(source)
+
+    def tick(self, now: float | None = None) -> int:
+        """Refresh every visible label now; returns how many changed."""
+        now = time.time() if now is None else now
+        with self._lock:
+            sources = self._sources.live()
+        changed = 0
+        for source in sources:
+            for label, timestamp in source():
+                text = format_relative(timestamp, now)
+                if label.value != text:
+                    label.value = text
+                    changed += 1
+        if changed:
+            self.page.update()
+        return changed
+
+    async def _run(self):
+        try:
+            await self._tick_while_registered()
+        finally:
+            # A failing tick must not stop the ticker for good
+            with self._lock:
+                self._task = self.page.run_task(self._run) if self._sources else None
+
+    async def _tick_while_registered(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.tick()
+            with self._lock:
+                if not self._sources:
+                    return
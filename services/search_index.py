@@ -0,0 +1,172 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Iterable
+
+
+GRAM_SIZE = 3
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _grams(text: str) -> set[str]:
+    # Fields shorter than a trigram are indexed whole so short values
+    # ("OK") stay searchable.
+    if len(text) < GRAM_SIZE:
+        return {text} if text else set()
+    return {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class TrigramIndex:
+    """
+    In-memory trigram inverted index for substring search.
+
+    `search(q)` returns the ids of documents where `q in field.lower()` for
+    any indexed field, by intersecting the posting lists of the query's
+    trigrams instead of scanning every document.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._docs: dict[int, tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id: int, fields: Iterable[str]):
+        lowered = tuple((f or "").lower() for f in fields)
+        if doc_id in self._docs:
+            if self._docs[doc_id] == lowered:
+                # Unchanged text (e.g. only the quantity was edited)
+                return
+            self.remove(doc_id)
+        self._docs[doc_id] = lowered
+        for field in lowered:
+            for gram in _grams(field):
+                self._postings[gram].add(doc_id)
+
+    def update(self, doc_id: int, fields: Iterable[str]):
+        self.add(doc_id, fields)
+
+    def remove(self, doc_id: int):
+        lowered = self._docs.pop(doc_id, None)
+        if lowered is None:
+            return
+        for field in lowered:
+            for gram in _grams(field):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    continue
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def clear(self):
+        self._postings.clear()
+        self._docs.clear()
+
+    def search(self, query: str) -> set[int]:
+        q = (query or "").lower()
+        if not q:
+            return set(self._docs)
+
+        if len(q) < GRAM_SIZE:
+            # Every field containing a short query has a gram containing it,
+            # so the union over matching grams is exact.
+            hits: set[int] = set()
+            for gram, posting in self._postings.items():
+                if q in gram:
+                    hits |= posting
+            return hits
+
+        postings = []
+        for gram in _grams(q):
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        if len(q) == GRAM_SIZE:
+            return set(postings[0])
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+
+        # Trigram hits can come from different positions or fields; confirm
+        # the actual substring.
+        docs = self._docs
+        return {d for d in candidates if any(q in f for f in docs[d])}
+
+
+class TokenIndex:
+    """
+    In-memory word index for prose fields such as alert messages.
+
+    Documents are indexed by their words, far fewer postings per document
+    than trigrams. `search(q)` returns the ids of documents that have, for
+    every word of `q`, a word starting with it ("lam" finds "Desk Lamp");
+    prefixes are looked up by binary search in the sorted vocabulary.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._docs: dict[int, frozenset[str]] = {}
+        self._vocabulary: list[str] | None = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id: int, fields: Iterable[str]):
+        tokens = frozenset(_TOKEN.findall(" ".join(f or "" for f in fields).lower()))
+        if doc_id in self._docs:
+            if self._docs[doc_id] == tokens:
+                return
+            self.remove(doc_id)
+        self._docs[doc_id] = tokens
+        for token in tokens:
+            posting = self._postings[token]
+            if not posting:
+                self._vocabulary = None
+            posting.add(doc_id)
+
+    def remove(self, doc_id: int):
+        tokens = self._docs.pop(doc_id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(doc_id)
+            if not posting:
+                del self._postings[token]
+                self._vocabulary = None
+
+    def clear(self):
+        self._postings.clear()
+        self._docs.clear()
+        self._vocabulary = None
+
+    def search(self, query: str) -> set[int]:
+        words = sorted(set(_TOKEN.findall((query or "").lower())), key=len, reverse=True)
+        if not words:
+            return set(self._docs)
+        if self._vocabulary is None:
+            # Rebuilt once after a batch of new / vanished words
+            self._vocabulary = sorted(self._postings)
+
+        hits: set[int] | None = None
+        for word in words:
+            matches: set[int] = set()
+            vocabulary = self._vocabulary
+            i = bisect_left(vocabulary, word)
+            while i < len(vocabulary) and vocabulary[i].startswith(word):
+                matches |= self._postings[vocabulary[i]]
+                i += 1
+            hits = matches if hits is None else hits & matches
+            if not hits:
+                return set()
+        return hits
@@ -0,0 +1,15 @@
+from typing import Callable, TypeVar
+
+import flet as ft
+
+
+T = TypeVar("T")
+
+
+def session_instance(page: ft.Page, key: str, factory: Callable[[ft.Page], T]) -> T:
+    """The session's object stored under `key`, built with `factory(page)` on first use."""
+    instance = page.session.get(key)
+    if instance is None:
+        instance = factory(page)
+        page.session.set(key, instance)
+    return instance
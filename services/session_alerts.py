@@ -0,0 +1,136 @@
+import asyncio
+import time
+from typing import Callable
+
+import flet as ft
+
+from services.alert_feed import start_alert_feed
+from services.alert_rules import Alert, AlertRuleEngine
+from services.alert_store import AlertStore
+from services.event_bus import ALERTS_TOPIC, STOCK_TOPIC, UpdateBatcher
+from services.inventory_repository import StockUpdate, get_inventory_repository
+from services.session import session_instance
+from services.weak_callbacks import WeakCallbacks
+
+
+_SESSION_KEY = "session_alerts"
+
+
+class SessionAlerts:
+    """
+    The alerts of one session, kept for the whole session.
+
+    The store outlives the alerts screen, which the screen cache drops and
+    rebuilds, so dismissals, resolutions and re-fire counts survive a
+    revisit and the suppression window spans them. It is filled once with
+    what the rules raise for the catalog, off the page loop (about 3 s at
+    100k SKUs), then kept current from the bus: pushed alerts are added
+    and the alerts of deleted SKUs removed, whether or not a screen shows
+    them. What is pushed during the fill waits until it is done, as the
+    fill holds the store's lock.
+
+    Screens `listen(callback)` to re-render; callbacks run on the page
+    loop, followed by one `page.update()`.
+    """
+
+    def __init__(self, page: ft.Page, engine: AlertRuleEngine | None = None):
+        self.page = page
+        self.engine = engine or AlertRuleEngine()
+        self.repo = get_inventory_repository()
+        self.store = AlertStore()
+        self.loaded = False
+        self._pushed: list[Alert] = []
+        self._removed: list[int] = []
+        self._listeners = WeakCallbacks()
+
+        start_alert_feed()
+        self._batcher = UpdateBatcher.for_page(page)
+        self._batcher.listen(ALERTS_TOPIC, self._on_alerts)
+        self._batcher.listen(STOCK_TOPIC, self._on_stock_updates)
+        self._loading = page.run_task(self._load)
+
+    @classmethod
+    def for_page(cls, page: ft.Page) -> "SessionAlerts":
+        """The session's alerts, created (and their fill started) on first use."""
+        return session_instance(page, _SESSION_KEY, cls)
+
+    @classmethod
+    def discard(cls, page: ft.Page) -> None:
+        """Drop the session's alerts, e.g. on logout."""
+        alerts = page.session.get(_SESSION_KEY)
+        if alerts is not None:
+            page.session.remove(_SESSION_KEY)
+            alerts.close()
+
+    def close(self):
+        self._loading.cancel()
+        self._batcher.unlisten(ALERTS_TOPIC, self._on_alerts)
+        self._batcher.unlisten(STOCK_TOPIC, self._on_stock_updates)
+
+    def listen(self, callback: Callable[[], None]) -> None:
+        """Call `callback()` after the fill and after every change (held weakly)."""
+        self._listeners.add(callback)
+
+    def unlisten(self, callback: Callable[[], None]) -> None:
+        self._listeners.discard(callback)
+
+    def _notify(self):
+        for callback in self._listeners.live():
+            callback()
+
+    def _on_alerts(self, alerts: list[Alert]):
+        # Page loop; the batcher sends one page.update() after it
+        if not self.loaded:
+            self._pushed += alerts
+            return
+        self.store.add_many(alerts)
+        self._notify()
+
+    def _on_stock_updates(self, updates: list[StockUpdate]):
+        removed = [i for update in updates for i in update.removed]
+        if not self.loaded:
+            self._removed += removed
+            return
+        if removed and self.store.remove_products(removed):
+            self._notify()
+
+    async def _load(self):
+        await asyncio.to_thread(self._fill_store)
+        self.store.add_many(self._pushed)
+        self.store.remove_products(self._removed)
+        self._pushed, self._removed = [], []
+        self.loaded = True
+        self._notify()
+        self.page.update()
+
+    def _fill_store(self):
+        # Worker thread; the store locks itself
+        self.store.add_many(self.engine.alerts(self.repo) + _mock_alerts())
+
+
+def _mock_alerts() -> list[Alert]:
+    # Signals not derived from the catalog yet (forecasting, audits)
+    now = time.time()
+    hour = 3600
+    return [
+        Alert(
+            id="a2",
+            rule="demand-forecast",
+            type="Demand Spike Prediction",
+            severity="warning",
+            product_id=None,
+            product="Monitor Arms",
+            message="Monitor Arms expected to see 45% increase in demand over next 2 weeks.",
+            time=now - 4 * hour,
+        ),
+        Alert(
+            id="a5",
+            rule="stock-audit",
+            type="Stock Mismatch Detected",
+            severity="critical",
+            product_id=None,
+            product="Desk Lamp",
+            message="Potential discrepancy in Desk Lamp count - physical audit recommended.",
+            time=now - 6 * hour,
+        ),
+    ]
@@ -0,0 +1,124 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Iterable
+
+
+_MISSING = object()
+
+# Batches up to this size are applied one binary-search insert / delete at
+# a time (a memmove each); larger ones (imports) with one filter-and-sort
+# pass over the whole list, which costs about the same at 100k entries
+# whatever the batch size.
+_SMALL_BATCH = 256
+
+
+class SortIndex:
+    """
+    Ids kept in (key, id) order for one column.
+
+    Writes move a single entry (binary search + list insert), so reading a
+    sorted result never has to sort the catalog again. The flat id order is
+    cached between writes so reads are a single filtering pass.
+    """
+
+    def __init__(self):
+        self._entries: list[tuple[Any, int]] = []
+        self._keys: dict[int, Any] = {}
+        self._order: list[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, pairs: Iterable[tuple[int, Any]]):
+        """Replace the index from (item id, key) pairs."""
+        self._keys = dict(pairs)
+        self._entries = sorted((key, item_id) for item_id, key in self._keys.items())
+        self._order = None
+
+    def add(self, item_id: int, key: Any):
+        if self._keys.get(item_id, _MISSING) == key:
+            return
+        self.remove(item_id)
+        insort(self._entries, (key, item_id))
+        self._keys[item_id] = key
+        self._order = None
+
+    def add_many(self, pairs: Iterable[tuple[int, Any]]):
+        """
+        Add or move many entries at once. Small batches (a single edit) are
+        inserted one by one; for a bulk import the new entries are appended
+        and merged with one sort, which is linear on the already ordered
+        list, instead of one list insert each.
+        """
+        pairs = [(i, k) for i, k in pairs if self._keys.get(i, _MISSING) != k]
+        if not pairs:
+            return
+        if len(pairs) <= _SMALL_BATCH:
+            for item_id, key in pairs:
+                self.add(item_id, key)
+            return
+        moved = {i for i, _ in pairs if i in self._keys}
+        if moved:
+            self._entries = [e for e in self._entries if e[1] not in moved]
+        for item_id, key in pairs:
+            self._keys[item_id] = key
+            self._entries.append((key, item_id))
+        self._entries.sort()
+        self._order = None
+
+    def remove(self, item_id: int):
+        key = self._keys.pop(item_id, _MISSING)
+        if key is _MISSING:
+            return
+        del self._entries[bisect_left(self._entries, (key, item_id))]
+        self._order = None
+
+    def remove_many(self, item_ids: Iterable[int]):
+        """Bulk `remove`: one filtering pass instead of one list delete each."""
+        item_ids = list(item_ids)
+        if len(item_ids) <= _SMALL_BATCH:
+            for item_id in item_ids:
+                self.remove(item_id)
+            return
+        removed = {i for i in item_ids if self._keys.pop(i, _MISSING) is not _MISSING}
+        if not removed:
+            return
+        self._entries = [e for e in self._entries if e[1] not in removed]
+        self._order = None
+
+    def page(
+        self,
+        after: tuple | None,
+        limit: int,
+        descending: bool = False,
+        members: set[int] | None = None,
+    ) -> tuple[list[int], tuple | None]:
+        """
+        Up to `limit` ids following the cursor `after` (a (key, id) entry;
+        None starts at the top) and the cursor to pass for the next page,
+        None once the end is reached. The start is found by binary search,
+        so deep pages cost the same as the first.
+        """
+        entries = self._entries
+        if descending:
+            start = len(entries) if after is None else bisect_left(entries, after)
+            positions = range(start - 1, -1, -1)
+        else:
+            start = 0 if after is None else bisect_right(entries, after)
+            positions = range(start, len(entries))
+        ids: list[int] = []
+        for position in positions:
+            entry = entries[position]
+            if members is None or entry[1] in members:
+                ids.append(entry[1])
+                if len(ids) == limit:
+                    return ids, entry
+        return ids, None
+
+    def ids(self, descending: bool = False, members: set[int] | None = None) -> list[int]:
+        """Ids in key order, optionally restricted to `members`."""
+        if self._order is None:
+            self._order = [item_id for _, item_id in self._entries]
+        order = self._order[::-1] if descending else self._order
+        if members is None:
+            return list(order)
+        return [item_id for item_id in order if item_id in members]
@@ -0,0 +1,154 @@
+import time
+from typing import Iterable
+
+import numpy as np
+
+from services.product import Status
+
+
+# Thresholds for SKUs that do not set their own.
+DEFAULT_REORDER_POINT = 15
+DEFAULT_OVERSTOCK_CEILING = 150
+DEFAULT_DEAD_STOCK_DAYS = 90
+
+# Engine inputs, in the order `set_many` takes them after the item id
+INPUT_COLUMNS = (
+    "quantity",
+    "reorder_point",
+    "overstock_ceiling",
+    "dead_stock_days",
+    "last_sale",
+)
+
+_DAY = 86400
+
+# Status per code; -1 marks a slot with no derived status yet
+_CODES = (Status.OK, Status.LOW, Status.OVERSTOCK, Status.DEAD_STOCK)
+_UNKNOWN = -1
+_CODE_OF = {status.value: code for code, status in enumerate(_CODES)}
+
+
+class StockStatusEngine:
+    """
+    Derives stock status from quantity and per-SKU thresholds.
+
+    Inputs live in parallel NumPy columns indexed by item id, so a threshold
+    change re-derives every SKU in one vectorised pass without reading the
+    catalog back, and a single stock movement re-derives one slot. The
+    rule, in priority order:
+
+    - stock that has not sold for `dead_stock_days` is Dead Stock
+    - at or below the reorder point is Low
+    - at or above the overstock ceiling is Overstock
+    - anything between is OK
+    """
+
+    def __init__(self):
+        self._quantity = np.zeros(0, dtype=np.int64)
+        self._reorder_point = np.zeros(0, dtype=np.int64)
+        self._overstock_ceiling = np.zeros(0, dtype=np.int64)
+        self._dead_stock_days = np.zeros(0, dtype=np.int64)
+        self._last_sale = np.zeros(0, dtype=np.float64)  # NaN = never sold
+        self._codes = np.zeros(0, dtype=np.int8)
+        self._present = np.zeros(0, dtype=bool)
+
+    def set_many(self, rows: Iterable[tuple]):
+        """Store (item id, *INPUT_COLUMNS) rows; statuses are left to `recompute`."""
+        rows = list(rows)
+        if not rows:
+            return
+        ids, quantity, reorder_point, ceiling, days, last_sale = zip(*rows)
+        ids = np.asarray(ids, dtype=np.int64)
+        self._reserve(int(ids.max()) + 1)
+        self._quantity[ids] = quantity
+        self._reorder_point[ids] = reorder_point
+        self._overstock_ceiling[ids] = ceiling
+        self._dead_stock_days[ids] = days
+        self._last_sale[ids] = np.asarray(last_sale, dtype=np.float64)  # None -> NaN
+        fresh = ~self._present[ids]
+        self._codes[ids[fresh]] = _UNKNOWN
+        self._present[ids] = True
+
+    def load_statuses(self, pairs: Iterable[tuple[int, str]]):
+        """Seed the current status of (item id, status label) pairs, e.g. as stored."""
+        for item_id, label in pairs:
+            self._codes[item_id] = _CODE_OF.get(label, _UNKNOWN)
+
+    def set_thresholds(self, item_ids: list[int] | None = None, **thresholds):
+        """Assign the same threshold values to `item_ids` (all SKUs when None)."""
+        slots = self._slots(item_ids)
+        for column, value in thresholds.items():
+            getattr(self, f"_{column}")[slots] = value
+
+    def remove_many(self, item_ids: Iterable[int]):
+        ids = np.fromiter(item_ids, dtype=np.int64)
+        ids = ids[ids < len(self._present)]
+        self._present[ids] = False
+        self._codes[ids] = _UNKNOWN
+
+    def recompute(
+        self, item_ids: list[int] | None = None, now: float | None = None
+    ) -> dict[int, tuple[Status | None, Status]]:
+        """
+        Re-derive `item_ids` (all SKUs when None) and return the ones whose
+        status changed as {item_id: (old, new)}; old is None for SKUs seen
+        for the first time.
+        """
+        now = time.time() if now is None else now
+        slots = self._slots(item_ids)
+        if not len(slots):
+            return {}
+        qty = self._quantity[slots]
+        # NaN comparisons are False, so never-sold SKUs are not dead
+        idle = now - self._last_sale[slots]
+        dead = (qty > 0) & (idle >= self._dead_stock_days[slots] * _DAY)
+        new = np.select(
+            [dead, qty <= self._reorder_point[slots], qty >= self._overstock_ceiling[slots]],
+            [3, 1, 2],
+            default=0,
+        ).astype(np.int8)
+        old = self._codes[slots]
+        changed = new != old
+        self._codes[slots] = new
+        return {
+            item_id: (None if o == _UNKNOWN else _CODES[o], _CODES[n])
+            for item_id, o, n in zip(
+                slots[changed].tolist(), old[changed].tolist(), new[changed].tolist()
+            )
+        }
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """
+        Copy of the inputs of every SKU: "id" plus one array per
+        INPUT_COLUMNS entry, aligned, for other vectorised passes (alerts).
+        """
+        slots = self._slots(None)
+        columns = {"id": slots}
+        for column in INPUT_COLUMNS:
+            columns[column] = getattr(self, f"_{column}")[slots]
+        return columns
+
+    def _slots(self, item_ids: list[int] | None) -> np.ndarray:
+        if item_ids is None:
+            return np.flatnonzero(self._present)
+        ids = np.asarray(list(item_ids), dtype=np.int64)
+        ids = ids[ids < len(self._present)]
+        return ids[self._present[ids]]
+
+    def _reserve(self, size: int):
+        if size <= len(self._present):
+            return
+        size = max(size, 2 * len(self._present), 1024)
+        for name in (
+            "_quantity",
+            "_reorder_point",
+            "_overstock_ceiling",
+            "_dead_stock_days",
+            "_last_sale",
+            "_codes",
+            "_present",
+        ):
+            column = getattr(self, name)
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
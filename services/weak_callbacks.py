@@ -0,0 +1,38 @@
+import weakref
+from typing import Callable
+
+
+class WeakCallbacks:
+    """
+    Subscriber list of a long-lived service that does not keep subscribers
+    alive.
+
+    Bound methods are held weakly, so a screen subscribed to a shared
+    repository or bus can still be collected once its session drops it;
+    plain functions and lambdas are held strongly, as nothing else may
+    reference them. Not locked: owners guard it with their own lock.
+    """
+
+    def __init__(self):
+        self._refs: list = []
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def add(self, callback: Callable) -> None:
+        self._refs.append(
+            weakref.WeakMethod(callback)
+            if hasattr(callback, "__self__")
+            else (lambda: callback)
+        )
+
+    def discard(self, callback: Callable) -> None:
+        # Bound methods compare equal when they wrap the same function of
+        # the same object
+        self._refs = [ref for ref in self._refs if ref() not in (None, callback)]
+
+    def live(self) -> list[Callable]:
+        """Callbacks whose owners are still alive; dead entries are dropped."""
+        callbacks = [ref() for ref in self._refs]
+        self._refs = [ref for ref, cb in zip(self._refs, callbacks) if cb is not None]
+        return [cb for cb in callbacks if cb is not None]
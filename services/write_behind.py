@@ -0,0 +1,93 @@
+import asyncio
+import os
+import threading
+from typing import Callable, Hashable
+
+import flet as ft
+
+
+# Quiet time after the last edit before pending edits are written.
+WRITE_BEHIND_DELAY_S = float(os.environ.get("VYAPAR_WRITE_BEHIND_MS", "400")) / 1000
+
+# Edits written per transaction; a full batch is written without waiting.
+WRITE_BEHIND_MAX_BATCH = 500
+
+
+class WriteBehindQueue:
+    """
+    Write-behind buffer for edits the screen has already shown.
+
+    `put(key, value)` records the latest value per key, so editing the same
+    SKU again before a flush replaces its pending value instead of queueing
+    a second write. After `delay` seconds without edits (or as soon as
+    `max_batch` keys are pending) the buffer is handed to `write(batch)` on
+    a worker thread as one {key: value} batch; batches are written one at
+    a time and in order. `on_done(batch)` or `on_error(batch, exc)` is then
+    called on the page's event loop, followed by one `page.update()`.
+    """
+
+    def __init__(
+        self,
+        page: ft.Page,
+        write: Callable[[dict], None],
+        on_done: Callable[[dict], None],
+        on_error: Callable[[dict, Exception], None],
+        delay: float = WRITE_BEHIND_DELAY_S,
+        max_batch: int = WRITE_BEHIND_MAX_BATCH,
+    ):
+        self.page = page
+        self.write = write
+        self.on_done = on_done
+        self.on_error = on_error
+        self.delay = delay
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, object] = {}
+        self._last_put = 0
+        self._task = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._pending[key] = value
+            self._last_put += 1
+            if self._task is None:
+                self._task = self.page.run_task(self._drain)
+
+    async def _drain(self):
+        try:
+            await self._drain_batches()
+        finally:
+            # Edits that arrived after the last batch was taken (or a failing
+            # callback) must not leave the queue without a drain
+            with self._lock:
+                self._task = self.page.run_task(self._drain) if self._pending else None
+
+    async def _drain_batches(self):
+        while True:
+            # Wait out the burst: restart the delay while edits keep coming
+            with self._lock:
+                seen = self._last_put
+            while self.delay > 0 and len(self._pending) < self.max_batch:
+                await asyncio.sleep(self.delay)
+                with self._lock:
+                    if self._last_put == seen:
+                        break
+                    seen = self._last_put
+
+            with self._lock:
+                if not self._pending:
+                    return
+                batch = dict(list(self._pending.items())[: self.max_batch])
+                for key in batch:
+                    del self._pending[key]
+
+            try:
+                await asyncio.to_thread(self.write, batch)
+            except Exception as ex:  # reported to the screen, which rolls back
+                self.on_error(batch, ex)
+            else:
+                self.on_done(batch)
+            self.page.update()